@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""Compare Eclipse3DProperties.__getitem__ (list) with .array (numpy view).
+
+usage: props_array.py [nx ny nz]
+"""
+
+import sys
+import timeit
+import sunbeam
+from synthetic import grid_deck
+
+
+def bench(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main(nx=100, ny=100, nz=100):
+    print('Parsing %dx%dx%d grid ...' % (nx, ny, nz))
+    props = sunbeam.parse(grid_deck(nx, ny, nz)).props()
+
+    for kw in ('PORO', 'PERMX'):
+        as_list  = bench(lambda: props[kw])
+        as_array = bench(lambda: props.array(kw))
+        print('%-6s list: %9.6f sec   array: %9.6f sec   speedup: %8.1fx'
+              % (kw, as_list, as_array, as_list / max(as_array, 1e-9)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:4]))
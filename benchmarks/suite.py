@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""Benchmark suite: parse and EclipseState build time, peak RSS and accessor
+latency over the bundled SPE3 and Norne decks and scaled synthetic decks.
+
+usage:
+    suite.py run [--quick] [--norne DECK] [--output results.json]
+    suite.py compare BASELINE CURRENT [--threshold 0.25]
+
+Every case runs in a fresh process, so peak RSS is that of the case alone.
+compare exits with status 1 if any metric in CURRENT is more than threshold
+(relative) worse than in BASELINE.
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import timeit
+from os.path import abspath, dirname, join
+
+import sunbeam
+from synthetic import field_deck
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = dirname(dirname(abspath(__file__)))
+SPE3 = join(ROOT, 'tests', 'spe3', 'SPE3CASE1.DATA')
+NORNE = join(ROOT, 'examples', 'data', 'norne', 'NORNE_ATW2013.DATA')
+
+RECOVERY = [('PARSE_RANDOM_SLASH', sunbeam.action.ignore)]
+
+# (name, (nx, ny, nz), wells, timesteps)
+SCALES = [
+    ('grid-20x20x10', (20, 20, 10), 10, 10),
+    ('grid-50x50x20', (50, 50, 20), 10, 10),
+    ('grid-100x100x50', (100, 100, 50), 10, 10),
+    ('wells-100', (50, 50, 5), 100, 10),
+    ('wells-1000', (50, 50, 5), 1000, 10),
+    ('steps-100', (20, 20, 5), 10, 100),
+    ('steps-1000', (20, 20, 5), 10, 1000),
+]
+
+QUICK_SCALES = [
+    ('grid-20x20x10', (20, 20, 10), 10, 10),
+    ('wells-100', (20, 20, 5), 100, 10),
+    ('steps-100', (20, 20, 5), 10, 100),
+]
+
+# Lower is better for every metric; metrics below these floors are noise
+NOISE_FLOOR = {'seconds': 1e-4, 'kb': 1024}
+
+
+def _maxrss_kb():
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _best(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def _timed(fn):
+    start = time.time()
+    value = fn()
+    return time.time() - start, value
+
+
+def _accessors(es, repeat):
+    """Latency of common accessors, None where the deck lacks the data"""
+    sch = es.schedule
+    last = len(sch.timesteps) - 1
+    wells = sch.wells
+    props = es.props()
+
+    def completions():
+        for well in wells:
+            list(well.completions(last))
+
+    def tables():
+        krw = es.table['SWOF', 'KRW']
+        return krw([i / 100.0 for i in range(101)])
+
+    accessors = {
+        'schedule_wells_seconds': lambda: sch.wells,
+        'well_completions_seconds': completions,
+        'props_permx_seconds': lambda: props['PERMX'],
+        'faults_seconds': es.faults,
+        'input_nnc_seconds': es.input_nnc,
+        'tables_eval_seconds': tables,
+    }
+
+    results = {}
+    for name, fn in sorted(accessors.items()):
+        try:
+            results[name] = _best(fn, repeat)
+        except Exception:
+            results[name] = None
+    return results
+
+
+def run_case(case):
+    """Run one case, (name, deck, recovery, repeat), and return its metrics"""
+    name, deck, recovery, repeat = case
+    result = {}
+    try:
+        result['parse_deck_seconds'], _ = _timed(
+            lambda: sunbeam.parse_deck(deck, recovery=recovery))
+        total, es = _timed(lambda: sunbeam.parse(deck, recovery=recovery))
+        result['state_build_seconds'] = max(total - result['parse_deck_seconds'], 0.0)
+        result['cold_schedule_wells_seconds'], _ = _timed(lambda: es.schedule.wells)
+        result.update(_accessors(es, repeat))
+        result['peak_rss_kb'] = _maxrss_kb()
+    except Exception as e:
+        result['error'] = '%s: %s' % (type(e).__name__, e)
+    return result
+
+
+def cases(quick, norne):
+    repeat = 3 if quick else 10
+    yield 'spe3', SPE3, [], repeat
+    yield 'norne', norne, RECOVERY, repeat
+    for name, (nx, ny, nz), wells, steps in (QUICK_SCALES if quick else SCALES):
+        yield name, field_deck(nx, ny, nz, wells, steps), [], repeat
+
+
+def run(args):
+    results = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sunbeam': sunbeam.__version__,
+            'quick': args.quick,
+        },
+        'cases': {},
+    }
+
+    for case in cases(args.quick, args.norne):
+        # a fresh process per case, so peak RSS is not inherited
+        pool = multiprocessing.Pool(1)
+        try:
+            result = pool.apply(run_case, (case,))
+        finally:
+            pool.close()
+            pool.join()
+        results['cases'][case[0]] = result
+        if 'error' in result:
+            print('%-18s error: %s' % (case[0], result['error']))
+        else:
+            print('%-18s parse %8.3f s  state %8.3f s  peak rss %8d kB'
+                  % (case[0], result['parse_deck_seconds'],
+                     result['state_build_seconds'], result['peak_rss_kb']))
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+def regressions(baseline, current, threshold):
+    """Yield (case, metric, old, new) for every metric that got worse by more
+    than threshold"""
+    for case, old_metrics in sorted(baseline['cases'].items()):
+        new_metrics = current['cases'].get(case, {})
+        for metric, old in sorted(old_metrics.items()):
+            new = new_metrics.get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+                continue
+            floor = NOISE_FLOOR['kb' if metric.endswith('_kb') else 'seconds']
+            if new > max(old, floor) * (1 + threshold):
+                yield case, metric, old, new
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    for case in sorted(set(baseline['cases']) | set(current['cases'])):
+        old = baseline['cases'].get(case, {})
+        new = current['cases'].get(case, {})
+        if 'error' in new and 'error' not in old:
+            print('%s: now fails: %s' % (case, new['error']))
+
+    found = list(regressions(baseline, current, args.threshold))
+    for case, metric, old, new in found:
+        print('REGRESSION %-18s %-30s %12.6g -> %12.6g (%+.0f%%)'
+              % (case, metric, old, new, 100.0 * (new - old) / old if old else 0))
+    if not found:
+        print('No regressions above %.0f%%' % (100 * args.threshold))
+    return 1 if found else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    sub = parser.add_subparsers(dest='command')
+
+    p = sub.add_parser('run', help='run the benchmarks')
+    p.add_argument('--quick', action='store_true', help='small scales only')
+    p.add_argument('--norne', default=NORNE, help='path to NORNE_ATW2013.DATA')
+    p.add_argument('--output', '-o', help='write results to this JSON file')
+
+    p = sub.add_parser('compare', help='compare two result files')
+    p.add_argument('baseline')
+    p.add_argument('current')
+    p.add_argument('--threshold', type=float, default=0.25,
+                   help='relative slowdown that counts as a regression')
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return compare(args)
+    run(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Synthetic decks of arbitrary size for benchmarking sunbeam."""
+
+def grid_deck(nx, ny, nz):
+    """A minimal deck with a regular nx*ny*nz grid and PORO/PERMX."""
+    n = nx * ny * nz
+    return '\n'.join([
+        'RUNSPEC',
+        'TITLE',
+        'SYNTHETIC %dx%dx%d' % (nx, ny, nz),
+        'DIMENS',
+        ' %d %d %d /' % (nx, ny, nz),
+        'START',
+        ' 1 JAN 2000 /',
+        'GRID',
+        'DX',
+        ' %d*100 /' % n,
+        'DY',
+        ' %d*100 /' % n,
+        'DZ',
+        ' %d*5 /' % n,
+        'TOPS',
+        ' %d*2000 /' % (nx * ny),
+        'PORO',
+        ' %d*0.25 /' % n,
+        'PERMX',
+        ' %d*100 /' % n,
+        '',
+    ])
+
+
+def _well_position(w, nx, ny):
+    return w % nx + 1, (w // nx) % ny + 1
+
+
+def field_deck(nx, ny, nz, wells=10, timesteps=10):
+    """A complete oil-water deck with a regular nx*ny*nz grid, one fault,
+    wells producers completed through the whole column and timesteps
+    monthly report steps, each changing the rate of the first well."""
+    n = nx * ny * nz
+    lines = [
+        'RUNSPEC',
+        'TITLE',
+        'SYNTHETIC %dx%dx%d %d WELLS %d STEPS' % (nx, ny, nz, wells, timesteps),
+        'DIMENS',
+        ' %d %d %d /' % (nx, ny, nz),
+        'OIL',
+        'WATER',
+        'METRIC',
+        'TABDIMS',
+        ' 1 1 20 20 /',
+        'WELLDIMS',
+        ' %d %d 1 %d /' % (wells, nz, wells),
+        'START',
+        ' 1 JAN 2000 /',
+        'GRID',
+        'DX',
+        ' %d*100 /' % n,
+        'DY',
+        ' %d*100 /' % n,
+        'DZ',
+        ' %d*5 /' % n,
+        'TOPS',
+        ' %d*2000 /' % (nx * ny),
+        'PORO',
+        ' %d*0.25 /' % n,
+        'PERMX',
+        ' %d*100 /' % n,
+        'PERMY',
+        ' %d*100 /' % n,
+        'PERMZ',
+        ' %d*10 /' % n,
+        'FAULTS',
+        " 'F1' %d %d 1 %d 1 %d 'X' /" % (max(nx // 2, 1), max(nx // 2, 1), ny, nz),
+        '/',
+        'PROPS',
+        'SWOF',
+        ' 0.2 0.0 1.0 0.0',
+        ' 0.5 0.3 0.3 0.0',
+        ' 0.8 1.0 0.0 0.0 /',
+        'PVTW',
+        ' 250 1.0 4e-5 0.5 0 /',
+        'PVDO',
+        ' 100 1.10 1.0',
+        ' 300 1.05 1.1 /',
+        'DENSITY',
+        ' 850 1000 1 /',
+        'ROCK',
+        ' 250 5e-5 /',
+        'SCHEDULE',
+        'WELSPECS',
+    ]
+    for w in range(wells):
+        lines.append(" 'W%d' 'G1' %d %d 1* 'OIL' /" % ((w + 1,) + _well_position(w, nx, ny)))
+    lines += ['/', 'COMPDAT']
+    for w in range(wells):
+        i, j = _well_position(w, nx, ny)
+        lines.append(" 'W%d' %d %d 1 %d 'OPEN' 1* 1* 0.2 /" % (w + 1, i, j, nz))
+    lines += ['/', 'WCONPROD']
+    for w in range(wells):
+        lines.append(" 'W%d' 'OPEN' 'ORAT' 100 4* 50 /" % (w + 1))
+    lines.append('/')
+    for step in range(timesteps):
+        lines += [
+            'WCONPROD',
+            " 'W1' 'OPEN' 'ORAT' %d 4* 50 /" % (100 + 10 * (step % 10)),
+            '/',
+            'TSTEP',
+            ' 30 /',
+        ]
+    lines.append('')
+    return '\n'.join(lines)
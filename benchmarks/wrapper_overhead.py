@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Compare the per-call overhead of the Python wrappers, the previous dynamic
+delegate against the slot-based one, on well accessors over wells x timesteps.
+
+usage: wrapper_overhead.py [wells timesteps]
+"""
+
+import sys
+import timeit
+import libsunbeam as lib
+import sunbeam
+from sunbeam.sunbeam import _delegate, delegate
+from synthetic import field_deck
+
+
+def legacy_delegate(delegate_cls, to='_sun'):
+    """The delegate decorator before wrappers used __slots__"""
+    attributes = set(delegate_cls.__dict__.keys())
+
+    def inner(cls):
+        class _property(object):
+            pass
+
+        setattr(cls, to, _property())
+        for attr in attributes - set(list(cls.__dict__.keys()) + ['__init__']):
+            setattr(cls, attr, _delegate(to, attr))
+
+        def new__new__(_cls, this, *args, **kwargs):
+            new = super(cls, _cls).__new__(_cls)
+            setattr(new, to, this)
+            return new
+
+        cls.__new__ = staticmethod(new__new__)
+        return cls
+
+    return inner
+
+
+@legacy_delegate(lib.Well)
+class LegacyWell(object):
+    pass
+
+
+@delegate(lib.Well)
+class SlotWell(object):
+    pass
+
+
+def bench(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def accessors(wells, timesteps):
+    def names():
+        for w in wells:
+            w.name
+
+    def status():
+        for t in timesteps:
+            for w in wells:
+                w.status(t)
+
+    def producer():
+        for t in timesteps:
+            for w in wells:
+                w.isproducer(t)
+
+    return [('name', names), ('status', status), ('isproducer', producer)]
+
+
+def main(wells=100, timesteps=100):
+    print('Parsing deck with %d wells and %d timesteps ...' % (wells, timesteps))
+    sch = sunbeam.parse(field_deck(20, 20, 5, wells, timesteps)).schedule
+    native = list(sch._wells)
+    steps = range(len(sch.timesteps))
+
+    legacy = bench(lambda: [LegacyWell(w) for w in native])
+    slots = bench(lambda: [SlotWell(w) for w in native])
+    print('%-10s legacy: %9.6f sec   slots: %9.6f sec   speedup: %6.2fx'
+          % ('wrap', legacy, slots, legacy / max(slots, 1e-9)))
+
+    old = accessors([LegacyWell(w) for w in native], steps)
+    new = accessors([SlotWell(w) for w in native], steps)
+    raw = accessors(native, steps)
+    for (name, legacy), (_, slots), (_, direct) in zip(old, new, raw):
+        legacy, slots, direct = bench(legacy), bench(slots), bench(direct)
+        print('%-10s legacy: %9.6f sec   slots: %9.6f sec   speedup: %6.2fx'
+              '   (native: %9.6f sec)'
+              % (name, legacy, slots, legacy / max(slots, 1e-9), direct))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
@@ -3,7 +3,6 @@
 import sys
 from os.path import isdir, join
 import sunbeam
-from datetime import datetime as dt
 
 def opmdatadir():
     global OPMDATA_DIR
@@ -20,10 +19,9 @@ def haveopmdata():
     return opmdatadir() is not None
 
 def parse(fname):
-    s = dt.now()
-    es = sunbeam.parse(fname, ('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
-    e = dt.now()
-    print('Parsing took %s sec' % (e - s).seconds)
+    es = sunbeam.parse(fname, ('PARSE_RANDOM_SLASH', sunbeam.action.ignore),
+                       profile=True)
+    print(es.profile.summary())
     return es
 
 def swof_krw(ecl):
@@ -32,9 +30,10 @@ def swof_krw(ecl):
     krow = ecl.table['SWOF', 'KROW']
     pcow = ecl.table['SWOF', 'PCOW']
 
+    sw = [i/20.0 for i in range(21)]
     print('SWOF\tKRW\tKROW\tPCOW')
-    for i in range(21):
-        print('%.2f\t%.4f\t%.4f\t%.4f' % (i/20.0, krw(i/20.0), krow(i/20.0), pcow(i/20.0)))
+    for row in zip(sw, krw(sw), krow(sw), pcow(sw)):
+        print('%.2f\t%.4f\t%.4f\t%.4f' % row)
 
 def main():
     es = parse(join(opmdatadir(), 'norne/NORNE_ATW2013.DATA'))
@@ -15,10 +15,10 @@ def plotswof(ecl):
     krow = ecl.table['SWOF', 'KROW']
     pcow = ecl.table['SWOF', 'PCOW']
 
-    swofl = [x/20.0       for x in range(21)]
-    krwl  = [krw(x/20.0)  for x in range(21)]
-    krowl = [krow(x/20.0) for x in range(21)]
-    pcowl = [pcow(x/20.0) for x in range(21)]
+    swofl = np.linspace(0, 1, 21)
+    krwl  = krw(swofl)
+    krowl = krow(swofl)
+    pcowl = pcow(swofl)
 
     plt.figure(1)
     plt.plot(swofl, krwl, label = 'KRW')
@@ -50,7 +50,7 @@ def parse(fname):
     s = dt.now()
     es = sunbeam.parse(fname, ('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
     e = dt.now()
-    print('Parsing took %s sec' % (e - s).seconds)
+    print('Parsing took %.2f sec' % (e - s).total_seconds())
     return es
 
 
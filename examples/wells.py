@@ -9,11 +9,14 @@ def main():
     print('schedule:  %s' % sc)
     print('prod well: %s' % wp)
     print('inj  well: %s' % wi)
-    for i in range(len(sc.timesteps)):
-        if not wp.isproducer(i) or wp.isinjector(i):
-            print('wp is not producer in step %s' % sc.timesteps[i])
-        if not wi.isinjector(i) or wi.isproducer(i):
-            print('wi is not injector in step %s' % sc.timesteps[i])
+
+    tl = sc.well_timeline()
+    p, i = tl['wells'].index(wp.name), tl['wells'].index(wi.name)
+    for t, ts in enumerate(sc.timesteps):
+        if not tl['producer'][p, t] or tl['injector'][p, t]:
+            print('wp is not producer in step %s' % ts)
+        if not tl['injector'][i, t] or tl['producer'][i, t]:
+            print('wi is not injector in step %s' % ts)
 
 if __name__ == '__main__':
     main()
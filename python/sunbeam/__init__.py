@@ -5,7 +5,9 @@
 from .schedule import Well, Completion
 from .libsunbeam import action
 from .config     import EclipseConfig
-from .parser     import parse_deck, parse
+from .parser     import parse_deck, parse, parse_many, parse_async
+from .stream     import stream_deck
+from .session    import ParseSession
 
 __version__     = '0.0.4'
 __license__     = 'GNU General Public License version 3'
@@ -0,0 +1,71 @@
+import libsunbeam as lib
+from .sunbeam import delegate
+
+SECTIONS = ('RUNSPEC', 'GRID', 'EDIT', 'PROPS', 'REGIONS', 'SOLUTION',
+            'SUMMARY', 'SCHEDULE')
+
+
+@delegate(lib.Deck)
+class Deck(object):
+    """A parsed deck, with an index of its keywords.
+
+    The first lookup by name builds an index of where every keyword and
+    section is in the deck, after which lookups by name do not scan the deck.
+    """
+    __slots__ = ('_positions', '_sections', 'profile')
+
+    def __repr__(self):
+        return 'Deck(keywords: %d)' % len(self)
+
+    def _index(self):
+        if self._positions is None:
+            positions, sections = {}, {}
+            names = self._names()
+            start, section = 0, None
+            for i, name in enumerate(names):
+                positions.setdefault(name, []).append(i)
+                if name in SECTIONS:
+                    if section is not None:
+                        sections.setdefault(section, []).append((start, i))
+                    start, section = i + 1, name
+            if section is not None:
+                sections.setdefault(section, []).append((start, len(names)))
+            self._positions, self._sections = positions, sections
+        return self._positions
+
+    def positions(self, name):
+        """The positions of every occurrence of keyword name, in deck order"""
+        return list(self._index().get(name, ()))
+
+    def keywords(self, name):
+        """Every occurrence of keyword name, in deck order"""
+        return [self._sun[i] for i in self._index().get(name, ())]
+
+    def section(self, name):
+        """The keywords of section name, not including the section keyword.
+
+        Raises KeyError if the deck has no such section.
+        """
+        self._index()
+        if name not in self._sections:
+            raise KeyError(name)
+        return [self._sun[i]
+                for start, stop in self._sections[name]
+                for i in range(start, stop)]
+
+    def __contains__(self, name):
+        return name in self._index()
+
+    def count(self, name):
+        return len(self._index().get(name, ()))
+
+    def __getitem__(self, key):
+        # unknown keywords and indices are left to the deck to report
+        if isinstance(key, tuple):
+            name, index = key
+            positions = self._index().get(name, ())
+            if -len(positions) <= index < len(positions):
+                return self._sun[positions[index]]
+        elif key in self._index():
+            return self._sun[self._positions[key][-1]]
+        return self._sun[key]
@@ -0,0 +1,113 @@
+"""On-disk cache of parsed decks.
+
+A cache entry is keyed on the path and a content hash of the root deck file,
+the ParseContext settings, the keyword parser extensions and the sunbeam library
+itself. Every entry records the content hash of each file the deck includes,
+and is invalidated when any of them changes.
+
+opm-parser has no serialized form of a Deck, so an entry stores the parsed
+deck as written by the Deck itself: one flat, zlib compressed keyword stream
+with all includes resolved. Loading an entry parses that stream, which skips
+include resolution, reading the include tree and everything the parser
+discards (comments, whitespace, repeat counts), but the stream is still
+tokenized and parsed like any deck string. The data file of the deck, which
+IOConfig takes its input and output directories from, is not part of the
+stream and is restored to the root deck file after loading.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from os.path import abspath, getmtime, getsize, isfile, join
+
+import libsunbeam as lib
+from .includes import include_files
+
+_FORMAT = 2
+
+
+def _digest(fname):
+    h = hashlib.sha1()
+    with open(fname, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write(fname, data):
+    """Write data to fname atomically"""
+    tmp = '%s.%d.tmp' % (fname, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.rename(tmp, fname)
+
+
+class DeckCache(object):
+    """Cache of parsed decks in directory.
+
+    Args:
+        directory (str): Where to store cache entries. Created if it does not
+            exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, fname, recovery, keywords):
+        """The cache key of the deck in fname.
+
+        Args:
+            fname (str): Path to the root deck file.
+            recovery ([(str, action)]): The error recoveries of the parse.
+            keywords ([str]): The keyword parser extensions, as json strings.
+        """
+        h = hashlib.sha1()
+        settings = {
+            'format': _FORMAT,
+            'path': abspath(fname),
+            'root': _digest(fname),
+            'recovery': sorted((key, str(action)) for key, action in recovery),
+            'keywords': list(keywords),
+            'library': [getsize(lib.__file__), getmtime(lib.__file__)],
+        }
+        h.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+        return h.hexdigest()
+
+    def _paths(self, key):
+        base = join(self.directory, key)
+        return base + '.json', base + '.deck.z'
+
+    def load(self, fname, recovery, keywords):
+        """The cached deck text of fname, or None on a miss."""
+        manifest, data = self._paths(self.key(fname, recovery, keywords))
+        if not (isfile(manifest) and isfile(data)):
+            return None
+
+        with open(manifest) as f:
+            files = json.load(f)['files']
+
+        for path, digest in files.items():
+            current = _digest(path) if isfile(path) else None
+            if current != digest:
+                return None
+
+        with open(data, 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
+
+    def store(self, fname, recovery, keywords, deck):
+        """Store the parsed deck of fname."""
+        manifest, data = self._paths(self.key(fname, recovery, keywords))
+        included, missing = include_files(fname)
+
+        files = {path: _digest(path) for path in included}
+        files.update((path, None) for path in missing)
+
+        text = str(deck)
+        if not isinstance(text, bytes):
+            text = text.encode('utf-8')
+
+        _write(data, zlib.compress(text))
+        _write(manifest, json.dumps({'files': files}).encode('utf-8'))
@@ -0,0 +1,158 @@
+"""Lexical scanning of the INCLUDE structure of Eclipse decks.
+
+This does not parse the deck. It follows the INCLUDE and PATHS keywords to
+find the files that make up a deck, and splits the deck into segments of
+contiguous text from a single file, in the order the parser would see them.
+Relative include paths are resolved against the directory of the root file,
+like opm-parser does.
+"""
+
+import io
+import re
+from collections import namedtuple
+from os.path import abspath, dirname, isabs, join, normpath
+
+_token = re.compile(r"'[^']*'|\"[^\"]*\"|[^\s'\"]+")
+
+Segment = namedtuple('Segment', ['path', 'first_line', 'text'])
+Segment.__doc__ = """Contiguous text from one file, starting at line first_line
+(1-based), with INCLUDE statements removed."""
+
+
+def _strip_comment(line):
+    """line without a trailing -- comment, ignoring -- inside quotes"""
+    quote = None
+    for i, c in enumerate(line):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '\'"':
+            quote = c
+        elif line.startswith('--', i):
+            return line[:i]
+    return line
+
+
+def _tokens(line):
+    return _token.findall(_strip_comment(line))
+
+
+def _unquote(token):
+    if len(token) > 1 and token[0] == token[-1] and token[0] in '\'"':
+        return token[1:-1]
+    return token
+
+
+def _keyword(line):
+    """The keyword starting this line, or None"""
+    tokens = _tokens(line)
+    return tokens[0] if tokens else None
+
+
+def _records(lines, start):
+    """Yield the slash-terminated records of the keyword data from start.
+
+    Yields ([[token]], i) for every line i that completes one or more
+    records. The caller decides where the keyword ends.
+    """
+    records, current = [], []
+    for i in range(start, len(lines)):
+        for tok in _tokens(lines[i]):
+            if tok.endswith('/') and not tok[:1] in '\'"':
+                if tok != '/':
+                    current.append(tok[:-1])
+                records.append(current)
+                current = []
+            else:
+                current.append(tok)
+        if records:
+            yield records, i
+            records = []
+    if current:
+        raise ValueError('Unterminated record at end of input')
+
+
+class _Scanner(object):
+
+    def __init__(self, root, skip_missing):
+        self.root = abspath(root)
+        self.rootdir = dirname(self.root)
+        self.skip_missing = skip_missing
+        self.missing = []
+        self.paths = {}
+
+    def resolve(self, path):
+        for alias, value in self.paths.items():
+            path = path.replace('$' + alias, value)
+        if not isabs(path):
+            path = join(self.rootdir, path)
+        return normpath(path)
+
+    def segments(self, path):
+        try:
+            with io.open(path, encoding='latin-1') as f:
+                lines = f.read().splitlines(True)
+        except IOError:
+            if not self.skip_missing:
+                raise
+            self.missing.append(path)
+            return
+
+        first, i = 0, 0
+        while i < len(lines):
+            line = lines[i]
+            kw = None
+            if 'INCLUDE' in line or 'PATHS' in line:
+                kw = _keyword(line)
+            if kw not in ('INCLUDE', 'PATHS'):
+                i += 1
+                continue
+
+            if kw == 'PATHS':
+                last = i
+                for records, last in _records(lines, i + 1):
+                    if not records[-1]:
+                        break
+                    for rec in records:
+                        if len(rec) >= 2:
+                            self.paths[_unquote(rec[0])] = _unquote(rec[1])
+                i = last + 1
+                continue
+
+            records, last = next(_records(lines, i + 1), (None, None))
+            if not records or not records[0]:
+                raise ValueError('%s:%d: INCLUDE without file name' % (path, i + 1))
+            if i > first:
+                yield Segment(path, first + 1, ''.join(lines[first:i]))
+
+            for seg in self.segments(self.resolve(_unquote(records[0][0]))):
+                yield seg
+            first = i = last + 1
+
+        if first < len(lines):
+            yield Segment(path, first + 1, ''.join(lines[first:]))
+
+
+def segments(fname, skip_missing=False):
+    """Yield the Segments of the deck in fname, in deck order.
+
+    Raises IOError if an included file cannot be read, unless skip_missing is
+    True, in which case the include is ignored.
+    """
+    scanner = _Scanner(fname, skip_missing)
+    return scanner.segments(scanner.root)
+
+
+def include_files(fname):
+    """Absolute paths of the files that make up the deck in fname.
+
+    Returns (files, missing), where files are fname and every readable file it
+    includes, in deck order, and missing are included files that could not be
+    read.
+    """
+    scanner = _Scanner(fname, skip_missing=True)
+    files = []
+    for seg in scanner.segments(scanner.root):
+        if seg.path not in files:
+            files.append(seg.path)
+    return files, scanner.missing
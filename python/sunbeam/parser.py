@@ -1,14 +1,19 @@
-from os.path import isfile
+from os.path import abspath, isfile
+from collections import namedtuple
 import json
+import multiprocessing
+import pickle
+import sys
+from multiprocessing.pool import ThreadPool
 import libsunbeam as lib
-from .properties import EclipseState
+from .properties import EclipseState, LazyEclipseState, _measure
+from .deckcache import DeckCache
+from .deck import Deck
 
 
-def _parse_context(recovery):
-    ctx = lib.ParseContext()
-
+def _recoveries(recovery):
     if not recovery:
-        return ctx
+        return []
 
     # this might be a single tuple, in which case we unpack it and repack it
     # into a list. If it's not a tuple we assume it's an iterable and just
@@ -16,13 +21,36 @@ def _parse_context(recovery):
     if not isinstance(recovery, list):
         recovery = [recovery]
 
-    for key, action in recovery:
+    return recovery
+
+
+def _parse_context(recovery):
+    ctx = lib.ParseContext()
+
+    for key, action in _recoveries(recovery):
         ctx.update(key, action)
 
     return ctx
 
 
-def parse(deck, recovery=[]):
+def _cached_deck(fname, keywords, recovery, cache):
+    """Parse the deck in fname through the DeckCache in directory cache"""
+    cache = DeckCache(cache)
+    recovery = _recoveries(recovery)
+    ctx = _parse_context(recovery)
+
+    text = cache.load(fname, recovery, keywords)
+    if text is not None:
+        deck = lib.parse_deck(text, keywords, False, ctx)
+        deck._set_data_file(abspath(fname))
+        return deck
+
+    deck = lib.parse_deck(fname, keywords, True, ctx)
+    cache.store(fname, recovery, keywords, deck)
+    return deck
+
+
+def parse(deck, recovery=[], cache=None, sections=None, profile=False):
     """Parse a deck from either a string or file.
 
     Args:
@@ -48,21 +76,71 @@ def parse(deck, recovery=[]):
                 sunbeam.action.throw
                 sunbeam.action.warn
                 sunbeam.action.ignore
+        cache (str): Directory of an on-disk cache of parsed decks. When
+            given, and deck is a file, the parsed deck is stored in the cache
+            and reused as long as neither deck, any of its included files nor
+            the recoveries change.
+        sections ([str]): When given, return a LazyEclipseState that builds
+            the grid, tables, props and schedule sections on first access
+            instead of building the whole EclipseState up front. The named
+            sections are built immediately, pass an empty list to build
+            everything lazily. The time and memory spent on every section is
+            reported in the timings attribute of the state.
+        profile (bool): Profile the parse, see sunbeam.profiling. The
+            ParseProfile, with time per include file, per keyword type and
+            per EclipseState stage, is in the profile attribute of the
+            returned state. Profiling parses the deck several times over.
+            The per-file and per-keyword times are estimates, from parsing
+            every file and keyword type again on its own with the time of
+            parsing RUNSPEC alone subtracted. It always parses from the deck
+            and builds the full state, so cache and sections are rejected
+            with ValueError.
 
     Example:
         Parses a EclipseState from the NORNE data set with recovery set to
         ignore PARSE_RANDOM_SLASH error events.
             es = sunbeam.parse('~/opm-data/norne/NORNE_ATW2013.DATA',
                 recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
+        Parses only what is needed for the schedule.
+            es = sunbeam.parse('~/opm-data/norne/NORNE_ATW2013.DATA',
+                recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore),
+                sections=['schedule'])
+            print(es.timings)
+        Profiles the parse, and writes the profile as JSON.
+            es = sunbeam.parse('~/opm-data/norne/NORNE_ATW2013.DATA',
+                recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore),
+                profile=True)
+            print(es.profile.summary())
+            es.profile.to_json('norne-profile.json')
 
-    :rtype: EclipseState
+    :rtype: EclipseState|LazyEclipseState
     """
+    if profile:
+        if cache is not None or sections is not None:
+            raise ValueError('profile can not be combined with cache or sections')
+        from .profiling import profile_parse
+        _, es, report = profile_parse(deck, recovery)
+        es.profile = report
+        return es
+    if sections is not None:
+        timings = {}
+        with _measure(timings, 'deck'):
+            if isfile(deck) and cache is not None:
+                parsed = _cached_deck(deck, [], recovery, cache)
+            else:
+                parsed = lib.parse_deck(deck, [], isfile(deck),
+                                        _parse_context(recovery))
+        return LazyEclipseState(parsed, _parse_context(recovery), sections,
+                                timings)
+    if isfile(deck) and cache is not None:
+        parsed = _cached_deck(deck, [], recovery, cache)
+        return EclipseState(lib.EclipseState(parsed, _parse_context(recovery)))
     if isfile(deck):
         return EclipseState(lib.parse(deck, _parse_context(recovery)))
     return EclipseState(lib.parse_data(deck, _parse_context(recovery)))
 
 
-def parse_deck(deck, keywords=[], recovery=[]):
+def parse_deck(deck, keywords=[], recovery=[], cache=None, profile=False):
     """Parse a deck from either a string or file.
 
     Args:
@@ -91,6 +169,11 @@ def parse_deck(deck, keywords=[], recovery=[]):
                 sunbeam.action.throw
                 sunbeam.action.warn
                 sunbeam.action.ignore
+        cache (str): Directory of an on-disk cache of parsed decks, see
+            sunbeam.parse.
+        profile (bool): Profile the parse, see sunbeam.parse. The
+            ParseProfile is in the profile attribute of the returned deck.
+            Raises ValueError together with cache.
 
     Examples:
         Parses a deck from the string "RUNSPEC\\n\\nDIMENS\\n 2 2 1 /\\n"
@@ -100,7 +183,7 @@ def parse_deck(deck, keywords=[], recovery=[]):
             deck = sunbeam.parse_deck('~/opm-data/norne/NORNE_ATW2013.DATA',
                 recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
 
-    :rtype: sunbeam.libsunbeam.Deck
+    :rtype: sunbeam.deck.Deck
     """
     if keywords:
         # this might be a single keyword dictionary, in which case we pack it
@@ -108,9 +191,182 @@ def parse_deck(deck, keywords=[], recovery=[]):
         # carry on
         if isinstance(keywords, dict):
             keywords = [keywords]
-        keywords = map(json.dumps, keywords)
+        keywords = list(map(json.dumps, keywords))
+    if profile:
+        if cache is not None:
+            raise ValueError('profile can not be combined with cache')
+        from .profiling import profile_parse
+        parsed, _, report = profile_parse(deck, recovery, keywords,
+                                          stages=False)
+        deck = Deck(parsed)
+        deck.profile = report
+        return deck
     is_file = isfile(deck) # If the deck is a file, the deck is read from
                            # that file. Otherwise it is assumed to be a
                            # string representation of the the deck.
+    if is_file and cache is not None:
+        return Deck(_cached_deck(deck, keywords, recovery, cache))
     pc = _parse_context(recovery) if recovery else lib.ParseContext()
-    return lib.parse_deck(deck, keywords, is_file, pc)
+    return Deck(lib.parse_deck(deck, keywords, is_file, pc))
+
+
+def parse_async(deck, recovery=[], loop=None, executor=None):
+    """Parse a deck without blocking the asyncio event loop.
+
+    The parse runs in executor, the default executor of loop if None, and
+    releases the GIL while parsing, so that several decks can be parsed
+    concurrently on several cores. Requires python 3.4 or newer.
+
+    Args:
+        deck (str): Either an eclipse deck string or path to a file to open.
+        recovery ((str, action)|[(str, action)]): List of error recoveries,
+            see parse.
+        loop (asyncio.AbstractEventLoop): The event loop, defaults to the
+            current event loop.
+        executor (concurrent.futures.Executor): Where to run the parse.
+
+    Example:
+        es = await sunbeam.parse_async('NORNE_ATW2013.DATA',
+            recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
+
+    :rtype: asyncio.Future
+    """
+    import asyncio
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    return loop.run_in_executor(executor, parse, deck, recovery)
+
+
+ParseResult = namedtuple('ParseResult', ['index', 'deck', 'value', 'error'])
+ParseResult.__doc__ = """The outcome of parsing decks[index] in parse_many.
+
+value is the parsed EclipseState, or what extract returned for it, and is None
+if parsing failed. error is None on success, otherwise a string describing the
+error.
+"""
+
+_worker_recovery = []
+_worker_extract = None
+
+
+def _init_worker(recovery, extract):
+    # sunbeam.action values are not picklable, so they are passed by name
+    global _worker_recovery, _worker_extract
+    _worker_recovery = [(key, getattr(lib.action, action.split('.')[-1]))
+                        for key, action in recovery]
+    _worker_extract = extract
+
+
+def _parse_one(index, deck, recovery, extract):
+    try:
+        es = parse(deck, recovery)
+        value = extract(es) if extract else es
+        return ParseResult(index, deck, value, None)
+    except Exception as e:
+        return ParseResult(index, deck, None, '%s: %s' % (type(e).__name__, e))
+
+
+def _parse_worker(task):
+    index, deck = task
+    result = _parse_one(index, deck, _worker_recovery, _worker_extract)
+    if result.error is not None:
+        return result
+    # the value is pickled here, so an unpicklable value fails this deck
+    # instead of the whole pool, and parse_many unpickles it
+    try:
+        value = pickle.dumps(result.value, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        return ParseResult(index, deck, None,
+                           'extract returned an unpicklable value: %s: %s'
+                           % (type(e).__name__, e))
+    return result._replace(value=value)
+
+
+def _can_fork():
+    if hasattr(multiprocessing, 'get_all_start_methods'):
+        return 'fork' in multiprocessing.get_all_start_methods()
+    return sys.platform != 'win32'
+
+
+def _process_pool(workers, recovery, extract):
+    """A pool of forked worker processes where fork is available, so extract
+    is inherited and can be any callable. Elsewhere the workers are spawned
+    and extract is pickled, which is checked here rather than failing in the
+    pool."""
+    initargs = (recovery, extract)
+    context = getattr(multiprocessing, 'get_context', None)
+    if _can_fork():
+        if context is None:
+            return multiprocessing.Pool(workers, _init_worker, initargs)
+        return context('fork').Pool(workers, _init_worker, initargs)
+
+    try:
+        pickle.dumps(extract)
+    except Exception as e:
+        raise TypeError('extract must be picklable, e.g. a module level '
+                        'function, where worker processes cannot be '
+                        'forked: %s' % e)
+    if context is None:
+        return multiprocessing.Pool(workers, _init_worker, initargs)
+    return context().Pool(workers, _init_worker, initargs)
+
+
+def parse_many(decks, recovery=[], workers=None, extract=None):
+    """Parse several decks in parallel, yielding results as they finish.
+
+    Args:
+        decks ([str]): Eclipse deck strings or paths to files, see parse.
+        recovery ((str, action)|[(str, action)]): Error recoveries applied to
+            every deck, see parse.
+        workers (int): Number of parallel workers, defaults to the number of
+            cores.
+        extract (callable): When given, the decks are parsed in a pool of
+            worker processes, and extract(es) is called in the worker for
+            every parsed EclipseState. What extract returns is sent back to
+            the caller, and must be picklable, e.g. numpy arrays from
+            es.props().array(...). Where fork is available (linux, macOS)
+            the workers are always forked and inherit extract, so it can be
+            any callable, including a lambda. Elsewhere (windows) extract must
+            be picklable, and TypeError is raised up front if it is not. A
+            value extract returns that cannot be pickled is reported as the
+            error of its deck.
+            When not given, the decks are parsed in a pool of threads in this
+            process, and the EclipseState objects themselves are returned.
+
+    The parser releases the GIL, so the thread pool parses on several cores
+    too. A deck that fails to parse does not stop the batch, its error is reported
+    in the result instead. Results are yielded in completion order, use
+    ParseResult.index to match them with decks.
+
+    Example:
+        Collect PERMX from an ensemble of realizations.
+            permx = {}
+            for r in sunbeam.parse_many(paths,
+                    recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore),
+                    extract=lambda es: es.props().array('PERMX')):
+                if r.error:
+                    print('%s failed: %s' % (r.deck, r.error))
+                else:
+                    permx[r.deck] = r.value
+
+    :rtype: Iterator[ParseResult]
+    """
+    recovery = _recoveries(recovery)
+
+    if extract is None:
+        pool = ThreadPool(workers)
+        worker = lambda task: _parse_one(task[0], task[1], recovery, None)
+    else:
+        by_name = [(key, str(action)) for key, action in recovery]
+        pool = _process_pool(workers, by_name, extract)
+        worker = _parse_worker
+
+    try:
+        for result in pool.imap_unordered(worker, enumerate(decks)):
+            if extract is not None and result.error is None:
+                result = result._replace(value=pickle.loads(result.value))
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
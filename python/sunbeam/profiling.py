@@ -0,0 +1,221 @@
+"""Profiling of deck parsing and EclipseState construction.
+
+opm-parser parses a deck in one call, so the parts of a parse are timed by
+parsing them again on their own: every include file, and every keyword type
+with all its occurrences, is parsed separately with the RUNSPEC section in
+front, and the time of parsing RUNSPEC alone is subtracted. The EclipseState
+stages are timed by building the grid, tables, props and schedule one at a
+time, like LazyEclipseState does, and then the full EclipseState.
+
+Profiling parses the deck two to three times over, plus one parse per keyword
+type, so it is meant for tracking down slow decks and parser regressions, not
+for every parse.
+"""
+
+import io
+import json
+import time
+from os.path import abspath, getsize, isfile, normpath
+
+import libsunbeam as lib
+from .includes import _keyword
+from .parser import _parse_context, _recoveries
+from .properties import LazyEclipseState, _maxrss_kb, _measure
+from .stream import SECTIONS, _skip_missing, chunks
+
+
+def _timed(f, repeat=1):
+    """(seconds, result) of the fastest of repeat calls to f"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.time()
+        result = f()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+class ParseProfile(dict):
+    """The profile of a parse, a dict of plain values that can be written as
+    JSON.
+
+    Keys:
+        deck: The deck file, None for a deck string.
+        parse: The seconds and peak RSS growth of parsing the deck.
+        baseline_seconds: The time of parsing RUNSPEC alone, the overhead of
+            every separate parse, which is subtracted from the times of files
+            and keywords.
+        files: Per file, in deck order: path, bytes, keywords and seconds.
+        keywords: Per keyword type, slowest first: name, count, bytes and
+            seconds, or error if the keyword cannot be parsed on its own.
+        stages: The seconds and peak RSS growth of building the grid, tables,
+            props, schedule and the full EclipseState, when profiled.
+        peak_rss_kb: The peak RSS of the process after profiling.
+    """
+
+    def to_json(self, fname=None, indent=2):
+        """The profile as JSON, also written to fname if given"""
+        text = json.dumps(self, indent=indent, sort_keys=True)
+        if fname is not None:
+            with open(fname, 'w') as f:
+                f.write(text)
+        return text
+
+    def summary(self, top=10):
+        """A human readable summary of the profile. The file and keyword
+        times are estimates from separate parses, see sunbeam.profiling."""
+        lines = ['parse: %.3f s' % self['parse']['seconds']]
+        for name, stage in sorted(self.get('stages', {}).items()):
+            lines.append('%s: %.3f s' % (name, stage['seconds']))
+        lines.append('file and keyword times are estimates from separate '
+                     'parses, minus the RUNSPEC baseline')
+        lines.append('slowest files:')
+        files = sorted(self['files'], key=lambda f: -f['seconds'])
+        for f in files[:top]:
+            lines.append('  %8.3f s %10d bytes  %s'
+                         % (f['seconds'], f['bytes'], f['path']))
+        lines.append('slowest keywords:')
+        for kw in self['keywords'][:top]:
+            lines.append('  %8.3f s %6d x  %s'
+                         % (kw['seconds'] or 0, kw['count'], kw['name']))
+        lines.append('peak rss: %d kB' % self['peak_rss_kb'])
+        return '\n'.join(lines)
+
+
+class _Profiler(object):
+
+    def __init__(self, deck, keywords, recovery):
+        self.deck = deck
+        self.is_file = isfile(deck)
+        self.keywords = keywords
+        self.context = _parse_context(recovery)
+        self.skip_missing = _skip_missing(recovery)
+        self._lines = {}
+
+    def parse(self, text):
+        return lib.parse_deck(text, self.keywords, False, self.context)
+
+    def lines(self, path):
+        if not path:
+            return self.deck.splitlines(True)
+        path = normpath(abspath(path))
+        if path not in self._lines:
+            with io.open(path, encoding='latin-1') as f:
+                self._lines[path] = f.read().splitlines(True)
+        return self._lines[path]
+
+    def setup(self):
+        scanned = list(chunks(self.deck, self.skip_missing))
+        self.runspec = ''.join(c.text for s, c in scanned if s == 'RUNSPEC')
+        self.empty, _ = _timed(lambda: self.parse(''), 3)
+        self.prefix, runspec = _timed(lambda: self.parse(self.runspec), 3)
+        self.nrunspec = len(runspec)
+        return scanned
+
+    def time_chunk(self, section, text):
+        """(seconds, keywords) of parsing text on its own"""
+        if section == 'RUNSPEC':
+            seconds, parsed = _timed(lambda: self.parse(text))
+            return max(seconds - self.empty, 0.0), len(parsed)
+        seconds, parsed = _timed(lambda: self.parse(self.runspec + text))
+        return max(seconds - self.prefix, 0.0), len(parsed) - self.nrunspec
+
+    def profile_files(self, scanned):
+        files, order = {}, []
+        for section, chunk in scanned:
+            path = chunk.path
+            if path not in files:
+                order.append(path)
+                size = getsize(path) if path else len(self.deck)
+                files[path] = {'path': path, 'bytes': size,
+                               'keywords': 0, 'seconds': 0.0}
+            seconds, count = self.time_chunk(section, chunk.text)
+            files[path]['seconds'] += seconds
+            files[path]['keywords'] += count
+        return [files[path] for path in order]
+
+    def blocks(self, deck):
+        """Yield (section, name, text) of every keyword in deck"""
+        locations = deck._locations()
+        section = 'RUNSPEC'
+        for i, (name, fname, line) in enumerate(locations):
+            if name in SECTIONS:
+                section = name
+            lines = self.lines(fname)
+            stop = len(lines)
+            if i + 1 < len(locations):
+                _, next_fname, next_line = locations[i + 1]
+                if next_fname == fname and next_line > line:
+                    stop = next_line - 1
+            block = [lines[line - 1]]
+            for text in lines[line:stop]:
+                if _keyword(text) in ('INCLUDE', 'PATHS'):
+                    break
+                block.append(text)
+            yield section, name, ''.join(block)
+
+    def profile_keywords(self, deck):
+        groups, order = {}, []
+        for section, name, text in self.blocks(deck):
+            if name not in groups:
+                order.append(name)
+                groups[name] = (section, [])
+            groups[name][1].append(text)
+
+        keywords = []
+        for name in order:
+            section, texts = groups[name]
+            text = ''.join(texts)
+            entry = {'name': name, 'count': len(texts),
+                     'bytes': len(text),
+                     'seconds': None}
+            try:
+                entry['seconds'], _ = self.time_chunk(section, text)
+            except Exception as e:
+                entry['error'] = '%s: %s' % (type(e).__name__, e)
+            keywords.append(entry)
+        keywords.sort(key=lambda kw: -(kw['seconds'] or 0))
+        return keywords
+
+
+def profile_parse(deck, recovery=[], keywords=[], stages=True):
+    """Parse deck and profile where the time goes.
+
+    Args:
+        deck (str): Either an eclipse deck string or path to a file to open.
+        recovery ((str, action)|[(str, action)]): List of error recoveries,
+            see sunbeam.parse.
+        keywords ([str]): Keyword parser extensions, as json strings.
+        stages (bool): Also build and profile the EclipseState.
+
+    Returns (deck, state, profile), where state is the full EclipseState, or
+    None if stages is False.
+
+    :rtype: (sunbeam.libsunbeam.Deck, EclipseState, ParseProfile)
+    """
+    recovery = _recoveries(recovery)
+    profiler = _Profiler(deck, keywords, recovery)
+    report = ParseProfile(deck=abspath(deck) if profiler.is_file else None)
+
+    timings = {}
+    with _measure(timings, 'parse'):
+        parsed = lib.parse_deck(deck, keywords, profiler.is_file,
+                                profiler.context)
+    report['parse'] = timings.pop('parse')
+
+    scanned = profiler.setup()
+    report['baseline_seconds'] = profiler.prefix
+    report['files'] = profiler.profile_files(scanned)
+    report['keywords'] = profiler.profile_keywords(parsed)
+
+    state = None
+    if stages:
+        lazy = LazyEclipseState(parsed, profiler.context, timings=timings)
+        for section in LazyEclipseState.SECTIONS:
+            lazy._section(section)
+        state = lazy._section('state')
+        report['stages'] = timings
+
+    report['peak_rss_kb'] = _maxrss_kb()
+    return parsed, state, report
@@ -1,17 +1,40 @@
+from contextlib import contextmanager
 from os.path import isfile
+import sys
+import time
+import numpy as np
 import libsunbeam as lib
 from .sunbeam import delegate
 from .schedule import Schedule
 from .config import EclipseConfig
 
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
+try:
+    _string = basestring
+except NameError:
+    _string = str
+
 @delegate(lib.EclipseState)
 class EclipseState(object):
+    __slots__ = ('_schedule_wrapper', '_faults', 'profile')
+
     def __repr__(self):
         return 'EclipseState(title = "%s")' % self.title
 
     @property
     def schedule(self):
-        return Schedule(self._schedule())
+        if self._schedule_wrapper is None:
+            self._schedule_wrapper = Schedule(self._schedule())
+        return self._schedule_wrapper
 
     def props(self):
         return Eclipse3DProperties(self._props())
@@ -26,14 +49,290 @@ class EclipseState(object):
     def table(self):
         return Tables(self._tables())
 
+    def input_nnc_arrays(self):
+        """The input NNCs as the numpy arrays 'cell1' and 'cell2' (global
+        cell indices) and 'trans'."""
+        return self._nnc_arrays()
+
+    def connections(self, nnc=True):
+        """Every connection between two active cells, as numpy arrays.
+
+        Connections are between cartesian neighbours in the i, j and k
+        directions, followed by the input NNCs unless nnc is False. Returns a
+        dict with the arrays 'cell1' and 'cell2' (active cell indices), 'nnc'
+        (True for NNCs) and 'trans' (the NNC transmissibility, nan for
+        neighbours).
+        """
+        grid = self.grid()
+        nx, ny, nz = grid.getNX(), grid.getNY(), grid.getNZ()
+        active = grid.activeMask().reshape(nz, ny, nx)
+        index = np.arange(nx * ny * nz).reshape(nz, ny, nx)
+
+        cell1, cell2 = [], []
+        for axis in (2, 1, 0):
+            lo, hi = [slice(None)] * 3, [slice(None)] * 3
+            lo[axis], hi[axis] = slice(None, -1), slice(1, None)
+            lo, hi = tuple(lo), tuple(hi)
+            both = active[lo] & active[hi]
+            cell1.append(index[lo][both])
+            cell2.append(index[hi][both])
+        neighbours = sum(len(c) for c in cell1)
+        is_nnc = [np.zeros(neighbours, dtype=bool)]
+        trans = [np.full(neighbours, np.nan)]
+
+        if nnc:
+            nncs = self._nnc_arrays()
+            flat = active.ravel()
+            both = flat[nncs['cell1']] & flat[nncs['cell2']]
+            cell1.append(nncs['cell1'][both])
+            cell2.append(nncs['cell2'][both])
+            is_nnc.append(np.ones(both.sum(), dtype=bool))
+            trans.append(nncs['trans'][both])
+
+        to_active = grid.globalToActive()
+        return {'cell1': to_active[np.concatenate(cell1)],
+                'cell2': to_active[np.concatenate(cell2)],
+                'nnc': np.concatenate(is_nnc),
+                'trans': np.concatenate(trans)}
+
+    def adjacency(self, nnc=True, format='csr'):
+        """The symmetric active cell adjacency matrix of connections.
+
+        Entry (a, b) counts the connections between active cells a and b, see
+        connections. format is 'csr' or 'coo' for a scipy.sparse matrix of
+        that format, which raises ImportError if scipy is not installed, or
+        'raw' for the CSR arrays (data, indices, indptr), which does not need
+        scipy.
+        """
+        if format not in ('csr', 'coo', 'raw'):
+            raise ValueError('Unknown format "%s", expected csr, coo or raw'
+                             % format)
+        if format != 'raw' and sparse is None:
+            raise ImportError('adjacency(format="%s") requires scipy, '
+                              'use format="raw" for the arrays' % format)
+        conn = self.connections(nnc)
+        n = self.grid().nactive()
+        row = np.concatenate([conn['cell1'], conn['cell2']])
+        col = np.concatenate([conn['cell2'], conn['cell1']])
+        data = np.ones(len(row))
+
+        if format == 'coo':
+            return sparse.coo_matrix((data, (row, col)), shape=(n, n))
+
+        order = np.argsort(row, kind='mergesort')
+        indices = col[order]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row, minlength=n), out=indptr[1:])
+        if format == 'csr':
+            return sparse.csr_matrix((data, indices, indptr), shape=(n, n))
+        return data, indices, indptr
+
+    def region_stats(self, region, values, weights=None, active_only=True):
+        """Count, sum, mean, min, max and weighted mean of values per region.
+
+        Args:
+            region (str): An integer grid property, e.g. 'FIPNUM'. Region
+                keywords missing from the deck get their default, like in
+                getRegions.
+            values (str|array): A grid property name, or one value per cell
+                of the grid, e.g. a derived quantity like pore volume.
+            weights (str|array): Weights of the weighted mean, like values.
+                Without weights the weighted mean is the mean.
+            active_only (bool): Only reduce over active cells.
+
+        Returns a dict of equally long arrays, one entry per region: 'region'
+        (the region ids, increasing), 'count', 'sum', 'mean', 'min', 'max'
+        and 'weighted_mean'. The reduction is done natively in one pass.
+        Raises TypeError if region is not an integer property.
+
+        Example:
+            Pore volume and volume weighted PERMX per FIPNUM region.
+                grid, props = es.grid(), es.props()
+                volume = grid.getCellVolumes()
+                pv = volume * props.array('PORO') * props.array('NTG')
+                fip = es.region_stats('FIPNUM', pv)
+                perm = es.region_stats('FIPNUM', 'PERMX', weights=volume)
+                dict(zip(fip['region'], fip['sum']))
+        """
+        props = self.props()
+
+        def cellwise(v):
+            return props.array(v) if isinstance(v, _string) else np.asarray(v)
+
+        values = cellwise(values)
+        weights = np.ones(len(values)) if weights is None else cellwise(weights)
+        if active_only:
+            mask = self.grid().activeMask()
+        else:
+            mask = np.ones(len(values), dtype=bool)
+        if region not in props:
+            # like getRegions, let opm fill in a defaulted region keyword
+            props.getRegions(region)
+        return lib._region_stats(props.array(region), values, weights, mask)
+
+    def fault_table(self):
+        """Every face of every fault as numpy arrays.
+
+        Returns a dict with the axis 'faults' (names), the per-fault array
+        'multiplier' (the MULTFLT transmissibility multiplier) and the equally
+        long arrays 'fault' (an index into 'faults'), 'global_index', 'i',
+        'j', 'k' and 'face', one row per fault face of a cell. 'face' holds
+        the codes listed in 'face_codes', e.g. 'X+'. The result is computed
+        once per EclipseState.
+        """
+        if self._faults is None:
+            self._faults = self._fault_table()
+        return self._faults
+
     def faults(self):
         """Returns a map from fault names to list of (i,j,k,D) where D ~ 'X+'"""
-        fs = {}
-        for fn in self.faultNames():
-            fs[fn] = self.faultFaces(fn)
+        table = self.fault_table()
+        faces = {code: face for face, code in table['face_codes'].items()}
+        fs = {name: [] for name in table['faults']}
+        rows = zip(table['fault'].tolist(), table['i'].tolist(),
+                   table['j'].tolist(), table['k'].tolist(),
+                   table['face'].tolist())
+        for fault, i, j, k, face in rows:
+            fs[table['faults'][fault]].append((i, j, k, faces[face]))
         return fs
 
 
+def _maxrss_kb():
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+@contextmanager
+def _measure(timings, name):
+    """Record the time and peak RSS growth of the block in timings[name]"""
+    rss, start = _maxrss_kb(), time.time()
+    yield
+    timings[name] = {'seconds': time.time() - start,
+                     'peak_rss_growth_kb': _maxrss_kb() - rss}
+
+
+class LazyEclipseState(object):
+    """An EclipseState that builds its sections on first access.
+
+    The grid, tables, props and schedule sections are built from the parsed
+    deck the first time they are accessed, together with the sections they
+    depend on: props needs grid and tables, and schedule needs grid and props.
+    Like in EclipseState, the grid takes the ACTNUM of the processed props,
+    so accessing the grid builds the props too.
+
+    Everything else (faults, NNCs, config, jfunc ...) is served by a full
+    EclipseState, built on first use. From then on all sections are served
+    by the full state, and the sections built before are released.
+
+    The time and peak RSS growth of parsing the deck and building every
+    section is recorded in timings, e.g.
+        {'deck': {'seconds': 1.2, 'peak_rss_growth_kb': 81920}, ...}
+    Peak RSS growth is the increase of the process' high-water mark, so a
+    section that fits in memory freed earlier reports 0.
+    """
+
+    SECTIONS = ('grid', 'tables', 'props', 'schedule', 'state')
+    _requires = {'props': ('tables', 'grid'), 'schedule': ('grid', 'props')}
+    _in_state = {'grid': '_grid', 'tables': '_tables', 'props': '_props',
+                 'schedule': '_schedule'}
+
+    def __init__(self, deck, context, sections=(), timings=None):
+        self._deck = deck
+        self._context = context
+        self._built = {}
+        self._wrapped = {}
+        self.timings = timings if timings is not None else {}
+        for section in sections:
+            self._section(section)
+
+    def _section(self, name):
+        if name not in self.SECTIONS:
+            raise ValueError('Unknown section "%s", expected one of %s'
+                             % (name, ', '.join(self.SECTIONS)))
+        if name not in self._built:
+            deps = [self._section(dep) for dep in self._requires.get(name, ())]
+            with _measure(self.timings, name):
+                self._built[name] = self._build(name, deps)
+            if name == 'state':
+                self._use_state(self._built['state'])
+        return self._built[name]
+
+    def _use_state(self, state):
+        """Serve every section from the full state, releasing the ones
+        built before"""
+        for name, getter in self._in_state.items():
+            self._built[name] = getattr(state, getter)()
+        self._wrapped = {}
+
+    def _build(self, name, deps):
+        if name == 'grid':
+            return lib.EclipseGrid(self._deck)
+        if name == 'tables':
+            return lib.Tables(self._deck)
+        if name == 'props':
+            tables, grid = deps
+            props = lib.Eclipse3DProperties(self._deck, tables, grid)
+            grid._reset_actnum(props)
+            return props
+        if name == 'schedule':
+            grid, props = deps
+            return lib.Schedule(self._deck, grid, props, self._context)
+        return EclipseState(lib.EclipseState(self._deck, self._context))
+
+    def _update(self, deck, stale, timings=None):
+        """A state of deck that shares the built sections of this state.
+
+        The sections in stale, and the sections that depend on them, are
+        built again from deck. The full state is never shared.
+        """
+        stale = set(stale) | set(['state'])
+        for name in self.SECTIONS:
+            if any(dep in stale for dep in self._requires.get(name, ())):
+                stale.add(name)
+
+        state = LazyEclipseState(deck, self._context, timings=timings)
+        state._built = {k: v for k, v in self._built.items() if k not in stale}
+        state._wrapped = {k: v for k, v in self._wrapped.items()
+                          if k not in stale}
+        return state
+
+    def _wrap(self, name, cls):
+        if name not in self._wrapped:
+            self._wrapped[name] = cls(self._section(name))
+        return self._wrapped[name]
+
+    def __repr__(self):
+        return 'EclipseState(title = "%s", lazy)' % self.title
+
+    @property
+    def title(self):
+        if 'TITLE' not in self._deck:
+            return ''
+        return ' '.join(self._deck['TITLE'][0][0])
+
+    @property
+    def schedule(self):
+        return self._wrap('schedule', Schedule)
+
+    def props(self):
+        return self._wrap('props', Eclipse3DProperties)
+
+    def grid(self):
+        self._section('props')  # the grid takes the ACTNUM of the props
+        return self._wrap('grid', EclipseGrid)
+
+    @property
+    def table(self):
+        return self._wrap('tables', Tables)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._section('state'), name)
+
+
 @delegate(lib.Eclipse3DProperties)
 class Eclipse3DProperties(object):
 
@@ -43,12 +342,30 @@ class Eclipse3DProperties(object):
 
 @delegate(lib.Tables)
 class Tables(object):
+    __slots__ = ('_columns',)
 
     def __repr__(self):
         return 'Tables()'
 
     def _eval(self, x, table, col_name, tab_idx = 0):
-        return self._evaluate(table, tab_idx, col_name, x)
+        """Evaluate column col_name in table at x, a number or an array-like.
+
+        The table and column lookup is done once per (table, column, index)
+        and reused for subsequent evaluations.
+        """
+        if self._columns is None:
+            self._columns = {}
+        columns = self._columns
+
+        key = (table, col_name, tab_idx)
+        if key not in columns:
+            columns[key] = self._column(table, tab_idx, col_name)
+        column = columns[key]
+
+        if np.isscalar(x):
+            return column(x)
+        x = np.asarray(x, dtype=np.float64)
+        return column(x.ravel()).reshape(x.shape)
 
     def __getitem__(self, tab_name):
         col_name = None
@@ -90,6 +407,24 @@ class EclipseGrid(object):
             raise ValueError('If not global_idx, need all three of i_idx, j_idx, and k_idx.')
         return self._cellVolume3(i_idx, j_idx, k_idx)
 
+    def getCellVolumes(self, active_only=False):
+        """Volume of every cell, or every active cell, as a numpy array."""
+        return self._cellVolumes(active_only)
+
+    def getCellDepths(self, active_only=False):
+        """Cell center depth of every cell, or every active cell."""
+        return self._cellDepths(active_only)
+
+    def getIJKs(self, active_only=False):
+        """(i,j,k) of every cell, or every active cell, as an (n, 3) array."""
+        return self._IJKs(active_only).reshape(-1, 3)
+
+    def globalIndices(self, i, j, k):
+        """Vectorized globalIndex, accepts scalars or arrays of i, j and k."""
+        nx, ny, _ = self._getXYZ()
+        i, j, k = np.asarray(i), np.asarray(j), np.asarray(k)
+        return i + nx * (j + ny * k)
+
     def eclGrid(self):
         return self._ecl_grid_ptr()
 
@@ -0,0 +1,296 @@
+"""Fast loading of grid property include files.
+
+Grid property includes, like the PERM, PORO and ACTNUM .prop files of Norne,
+are one or more keywords, each followed by a long array of numbers ended by
+a slash. They are tokenized by numpy, instead of by the deck parser.
+
+The arrays are the values as written in the file, in the units of the deck
+unless units is given, and not the EclipseState properties: defaults, BOX
+and the EQUALS, MULTIPLY ... edits of the deck are not applied. Files that
+use BOX or edit keywords are rejected rather than loaded wrong.
+
+A binary sidecar <file>.<KEYWORD>.npy can be stored next to the include,
+with a manifest <file>.npy.json recording the size and modification time of
+the include and the length of every array. The sidecars are used instead of
+the text as long as the include is unchanged, and are memory mapped, so they
+are shared with the page cache rather than copied into the process.
+"""
+
+import json
+import os
+import re
+from os.path import abspath, getmtime, getsize, isfile
+
+import numpy as np
+
+_keyword = re.compile(br'^[ \t]*([A-Z][A-Z0-9_+-]{0,7})[ \t]*(?:--[^\n]*)?\r?$',
+                      re.M)
+_comment = re.compile(br'--[^\n]*')
+# the first line with something else than blanks and comments
+_content = re.compile(br'^[ \t]*(?!--)\S', re.M)
+
+# keywords without data that may appear between property keywords
+_no_data = (b'ECHO', b'NOECHO')
+
+# keywords that change arrays in ways a plain reader cannot reproduce
+_edits = ('BOX', 'ENDBOX', 'EQUALS', 'MULTIPLY', 'ADD', 'COPY', 'MINVALUE',
+          'MAXVALUE', 'EQUALREG', 'MULTIREG', 'ADDREG', 'COPYREG', 'OPERATE')
+
+# SI factor of the keywords with a dimension, per unit system
+_length = {'METRIC': 1.0, 'FIELD': 0.3048, 'LAB': 0.01}
+_permeability = {'METRIC': 9.869233e-16, 'FIELD': 9.869233e-16,
+                 'LAB': 9.869233e-16}
+_dimensions = {
+    'DX': _length, 'DY': _length, 'DZ': _length, 'TOPS': _length,
+    'PERMX': _permeability, 'PERMY': _permeability, 'PERMZ': _permeability,
+}
+_dimensionless = ('PORO', 'NTG', 'SWATINIT', 'SWL', 'SWCR', 'SWU', 'SGL',
+                  'SGCR', 'SGU', 'SOWCR', 'SOGCR', 'MULTPV')
+
+
+def _dtype(keyword):
+    if keyword == 'ACTNUM' or keyword.endswith('NUM'):
+        return np.int32
+    return np.float64
+
+
+def _data_end(buf, start):
+    """Position of the slash ending the keyword data from start"""
+    pos = start
+    while True:
+        slash = buf.find(b'/', pos)
+        if slash < 0:
+            raise ValueError('Keyword data at byte %d not ended by /' % start)
+        line = max(buf.rfind(b'\n', start, slash) + 1, start)
+        if buf.find(b'--', line, slash) < 0:
+            return slash
+        pos = slash + 1
+
+
+def _repeat(token, dtype):
+    count, _, value = token.partition(b'*')
+    if not value:
+        raise ValueError('Defaulted values (%s) are not supported'
+                         % token.decode('latin-1'))
+    return np.repeat(np.array([value], dtype=dtype), int(count))
+
+
+def _tokenize(data, dtype):
+    """The numbers in data, a bytes string of keyword data"""
+    if b'--' in data:
+        data = _comment.sub(b'', data)
+    if b'D' in data or b'd' in data:
+        data = data.replace(b'D', b'E').replace(b'd', b'e')
+
+    tokens = data.split()
+    if b'*' in data:
+        parts = [_repeat(tok, dtype) if b'*' in tok
+                 else np.array([tok], dtype=dtype)
+                 for tok in tokens]
+        return np.concatenate(parts) if parts else np.empty(0, dtype)
+    return np.array(tokens, dtype=dtype)
+
+
+def _to_si(keyword, values, units):
+    if units is None or values.dtype != np.float64:
+        return values
+    if keyword in _dimensions:
+        return values * _dimensions[keyword][units]
+    if keyword in _dimensionless or keyword.startswith('MULT'):
+        return values
+    raise ValueError('The unit of %s is not known, load it with units=None'
+                     % keyword)
+
+
+# bumped when read_text changes, so sidecars of older readers are not used
+_FORMAT = 2
+
+
+def _sidecar(fname, keyword):
+    return '%s.%s.npy' % (fname, keyword)
+
+
+def _manifest(fname):
+    return fname + '.npy.json'
+
+
+def _write(fname, write):
+    """Write fname atomically with write(file)"""
+    tmp = '%s.%d.tmp' % (fname, os.getpid())
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.rename(tmp, fname)
+
+
+def _load_sidecars(fname):
+    """The arrays of the sidecars of fname, or None if they are missing,
+    incomplete or older than fname"""
+    try:
+        with open(_manifest(fname)) as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if manifest.get('format') != _FORMAT:
+        return None
+    if manifest.get('source') != [getsize(fname), getmtime(fname)]:
+        return None
+
+    arrays = []
+    for keyword, size in manifest['arrays']:
+        try:
+            values = np.load(_sidecar(fname, keyword), mmap_mode='r')
+        except (IOError, OSError, ValueError):
+            return None
+        if values.shape != (size,):
+            return None
+        arrays.append((keyword, values))
+    return arrays
+
+
+def _store_sidecars(fname, arrays):
+    for keyword, values in arrays:
+        _write(_sidecar(fname, keyword), lambda f: np.save(f, values))
+
+    # the manifest is written last, so a partial write is never used
+    manifest = {'format': _FORMAT,
+                'source': [getsize(fname), getmtime(fname)],
+                'arrays': [[kw, len(values)] for kw, values in arrays]}
+    text = json.dumps(manifest).encode('utf-8')
+    _write(_manifest(fname), lambda f: f.write(text))
+
+
+def read_text(fname):
+    """The keyword arrays of the text property file fname.
+
+    Returns an ordered list of (keyword, array) pairs, in the units of the
+    file. Integer keywords (ACTNUM and the *NUM region keywords) are int32,
+    everything else float64. Raises ValueError for BOX and edit keywords,
+    and for data that does not directly follow a keyword, like the later
+    records of multi-record keywords such as SWOF or PVTO.
+    """
+    with open(fname, 'rb') as f:
+        buf = f.read()
+
+    arrays = []
+    pos = 0
+    while True:
+        content = _content.search(buf, pos)
+        if content is None:
+            return arrays
+        match = _keyword.match(buf, content.start())
+        if match is None:
+            after = 'after %s' % arrays[-1][0] if arrays else 'before any keyword'
+            raise ValueError('%s: data %s, only keywords with a single '
+                             'record are supported' % (fname, after))
+        if match.group(1) in _no_data:
+            pos = match.end()
+            continue
+
+        keyword = match.group(1).decode('ascii')
+        if keyword in _edits:
+            raise ValueError('%s: %s is not supported, use sunbeam.parse'
+                             % (fname, keyword))
+        end = _data_end(buf, match.end())
+        try:
+            values = _tokenize(buf[match.end():end], _dtype(keyword))
+        except ValueError as e:
+            raise ValueError('%s: %s: %s' % (fname, keyword, e))
+        arrays.append((keyword, values))
+        # the rest of the line after the slash is a comment
+        pos = buf.find(b'\n', end)
+        if pos < 0:
+            return arrays
+
+
+def load(fname, units=None, sidecar=True, write_sidecar=False):
+    """The keyword arrays of the grid property include fname.
+
+    Args:
+        fname (str): Path to the property include.
+        units (str): The unit system of the deck, 'METRIC', 'FIELD' or 'LAB'.
+            The arrays are converted to SI, like EclipseState properties, and
+            keywords of unknown unit raise ValueError. With None the arrays
+            are in the units of the file.
+        sidecar (bool): Load from the .npy sidecars of fname if fname did
+            not change since they were written.
+        write_sidecar (bool): Write .npy sidecars when fname is read as text,
+            so later loads are memory mapped.
+
+    Returns a dict of read-only arrays, e.g. {'PERMX': array([...])}. Arrays
+    from sidecars without unit conversion are numpy.memmap.
+
+    Example:
+        perm = sunbeam.propfile.load('INCLUDE/PETRO/PERM_0704.prop',
+                                     units='METRIC',
+                                     write_sidecar=True)['PERMX']
+    """
+    if units is not None and units not in _length:
+        raise ValueError('Unknown unit system %s' % units)
+
+    arrays = _load_sidecars(fname) if sidecar else None
+    if arrays is None:
+        arrays = read_text(fname)
+        if write_sidecar and arrays:
+            _store_sidecars(fname, arrays)
+            arrays = _load_sidecars(fname)
+
+    result = {}
+    for keyword, values in arrays:
+        values = _to_si(keyword, values, units)
+        values.flags.writeable = False
+        result[keyword] = values
+    return result
+
+
+_units = re.compile(r'^[ \t]*(METRIC|FIELD|LAB)[ \t]*(?:--[^\n]*)?\r?$', re.M)
+_edit_line = re.compile(r'^[ \t]*(%s)[ \t]*(?:--[^\n]*)?\r?$' % '|'.join(_edits),
+                        re.M)
+
+
+def load_deck(deck, recovery=[], sidecar=True, write_sidecar=False):
+    """The arrays of the grid property includes of the deck file deck.
+
+    The deck is scanned lexically, without parsing it, for the include files
+    of its GRID, EDIT, PROPS and REGIONS sections. Every include that holds
+    only numeric keyword arrays of known unit is loaded with load, in SI
+    units, and when a keyword is in several files the last one wins, like in
+    the deck. Other includes, like tables, and keywords written in the deck
+    file itself, are left out.
+
+    Raises ValueError if those sections use BOX or edit keywords, since the
+    EclipseState arrays would then differ from the files.
+
+    Returns a dict of read-only arrays, e.g. {'PORO': array([...])}.
+    """
+    from .parser import _recoveries
+    from .stream import _skip_missing, chunks
+
+    root = abspath(deck)
+    runspec, paths = [], []
+    for section, chunk in chunks(deck, _skip_missing(_recoveries(recovery))):
+        if section == 'RUNSPEC':
+            runspec.append(chunk.text)
+            continue
+        if section not in ('GRID', 'EDIT', 'PROPS', 'REGIONS'):
+            continue
+        edit = _edit_line.search(chunk.text)
+        if edit is not None:
+            raise ValueError('%s: %s is not supported, use sunbeam.parse'
+                             % (chunk.path, edit.group(1)))
+        if chunk.path != root and chunk.path not in paths:
+            paths.append(chunk.path)
+
+    match = _units.search(''.join(runspec))
+    units = match.group(1) if match else 'METRIC'
+
+    result = {}
+    for path in paths:
+        if not isfile(path):
+            continue
+        try:
+            arrays = load(path, units, sidecar, write_sidecar)
+        except ValueError:
+            continue  # not a property include, e.g. tables
+        result.update(arrays)
+    return result
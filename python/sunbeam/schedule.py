@@ -1,26 +1,284 @@
 import libsunbeam as lib
 from .sunbeam import delegate
 
+try:
+    _string = basestring
+except NameError:
+    _string = str
+
+# The well predicates of Schedule.well_mask, either a boolean array of
+# well_timeline or the status the well must have
+_well_flags = ('defined', 'producer', 'injector')
+_well_status = {'flowing': 'OPEN', 'closed': 'SHUT', 'stopped': 'STOP',
+                'auto': 'AUTO'}
+
 @delegate(lib.Schedule)
 class Schedule(object):
+    __slots__ = ('_well_list', '_well_index', '_timeline', '_completions',
+                 '_snapshots', '_hierarchies', '_timesteps', '_axis',
+                 '_event_table', '_controls')
 
     def __repr__(self):
         lt = len(self.timesteps)
         lw = len(self.wells)
         return 'Schedule(timesteps: %d, wells: %d)' % (lt, lw)
 
+    def _cache_wells(self):
+        self._well_list = [Well(w) for w in self._wells]
+        self._well_index = {w.name: w for w in self._well_list}
+
     @property
     def wells(self):
-        return map(Well, self._wells)
+        """The wells of the schedule, as a new list of the cached Wells"""
+        if self._well_list is None:
+            self._cache_wells()
+        return list(self._well_list)
+
+    @property
+    def timesteps(self):
+        """The dates of the timesteps as naive datetime objects.
+
+        The dates are the ones in the deck, the same as time_axis, whatever
+        the local timezone.
+        """
+        if self._timesteps is None:
+            self._timesteps = self.time_axis.tolist()
+        return list(self._timesteps)
+
+    @property
+    def time_axis(self):
+        """The dates of the timesteps as a read-only numpy datetime64[s] array.
+
+        The dates are the ones in the deck, like timesteps. The array is
+        computed once per Schedule.
+        """
+        if self._axis is None:
+            axis = self._time_axis().view('datetime64[s]')
+            axis.flags.writeable = False
+            self._axis = axis
+        return self._axis
+
+    def events(self, timestep=None):
+        """What changed at every timestep, as columns.
+
+        Returns a dict with the axes 'wells' (names) and 'groups' (names),
+        the 'event_codes' and equally long arrays 'timestep', 'event', 'well'
+        and 'group', one row per event in timestep order. The events are:
+
+            WELL_NEW: The well is defined.
+            WELL_OPEN, WELL_STOP, WELL_SHUT, WELL_AUTO: The well status.
+            WELL_CONTROL: The well switched between producer and injector,
+                or its production or injection controls changed.
+            WELL_GROUP: The well moved to another group.
+            WELL_COMPLETIONS: The completions of the well changed.
+            GROUP_NEW: The group entered the group tree.
+            GROUP_PARENT: The group moved in the group tree.
+
+        At the timestep where a well is defined, its status, group and
+        completions are events too. 'well' is an index into 'wells' (-1 for
+        group events), and 'group' an index into 'groups', the group of the
+        well for well events. The rows of timestep t are
+        offsets[t]:offsets[t + 1] of the array 'offsets'.
+
+        With timestep, only the events of that timestep are returned. The
+        table is computed once per Schedule.
+        """
+        if self._event_table is None:
+            self._event_table = self._events()
+        table = self._event_table
+        if timestep is None:
+            return table
+
+        if not 0 <= timestep < len(table['offsets']) - 1:
+            raise IndexError('Timestep out of range')
+        first, last = table['offsets'][timestep], table['offsets'][timestep + 1]
+        events = dict(table)
+        events['offsets'] = table['offsets'][timestep:timestep + 2] - first
+        for column in ('timestep', 'event', 'well', 'group'):
+            events[column] = table[column][first:last]
+        return events
+
+    def changes(self, timestep):
+        """The events at timestep as (event, name) pairs, e.g.
+        ('WELL_SHUT', 'PROD'), where name is a well, or a group for the
+        GROUP_* events"""
+        events = self.events(timestep)
+        names = {code: name for name, code in events['event_codes'].items()}
+        return [(names[e], events['wells'][w] if w >= 0 else events['groups'][g])
+                for e, w, g in zip(events['event'].tolist(),
+                                   events['well'].tolist(),
+                                   events['group'].tolist())]
+
+    def change_points(self):
+        """The timesteps where anything changed, as a numpy array"""
+        offsets = self.events()['offsets']
+        return (offsets[1:] > offsets[:-1]).nonzero()[0]
+
+    def well_timeline(self):
+        """The state of every well at every timestep as numpy arrays.
+
+        Returns a dict with the axes 'wells' (names) and 'groups' (names),
+        and the (wells x timesteps) arrays 'status', 'defined', 'producer',
+        'injector' and 'group'. 'status' holds the codes listed in
+        'status_codes' (0 where the well is not yet defined), and 'group' is
+        an index into 'groups' (-1 where undefined). The result is computed
+        once per Schedule.
+        """
+        if self._timeline is None:
+            self._timeline = self._well_timeline()
+        return self._timeline
+
+    def well_mask(self, predicates, timesteps=None):
+        """Evaluate well predicates for every well over many timesteps.
+
+        Args:
+            predicates (str|[str]): One or more of 'defined', 'producer',
+                'injector', 'flowing', 'closed', 'stopped' and 'auto', each
+                optionally prefixed by 'not '. A well must satisfy all of
+                them.
+            timesteps (int|slice|[int]): The timesteps, all if None.
+
+        Returns a boolean numpy array of (wells x timesteps), or of wells for
+        a single timestep, with the wells in the order of Schedule.wells.
+        The predicates are evaluated on the arrays of well_timeline, without
+        a call per well and timestep.
+
+        Example:
+            # which producers are open at every timestep
+            mask = sch.well_mask(['producer', 'flowing'])
+        """
+        if isinstance(predicates, _string):
+            predicates = [predicates]
+        if timesteps is None:
+            timesteps = slice(None)
+        tl = self.well_timeline()
+
+        mask = None
+        for predicate in predicates:
+            name = predicate[len('not '):] if predicate.startswith('not ') else predicate
+            if name in _well_flags:
+                value = tl[name][:, timesteps]
+            elif name in _well_status:
+                code = tl['status_codes'][_well_status[name]]
+                value = tl['status'][:, timesteps] == code
+            else:
+                raise ValueError('Unknown well predicate %s' % predicate)
+
+            if name != predicate:
+                value = ~value
+            mask = value if mask is None else mask & value
+
+        if mask is None:
+            raise ValueError('No well predicates')
+        return mask
+
+    def well_names(self, predicates, timesteps=None):
+        """The names of the wells satisfying predicates, see well_mask.
+
+        Returns a list of names for a single timestep, and a list of lists of
+        names, one per timestep, otherwise.
+
+        Example:
+            # the open producers at every report step
+            for t, names in enumerate(sch.well_names(['producer', 'flowing'])):
+                ...
+        """
+        mask = self.well_mask(predicates, timesteps)
+        names = self.well_timeline()['wells']
+        if mask.ndim == 1:
+            return [names[w] for w in mask.nonzero()[0]]
+        return [[names[w] for w in column.nonzero()[0]] for column in mask.T]
+
+    def well_controls(self):
+        """The production and injection controls of every well at every
+        timestep, from WCONPROD, WCONHIST, WCONINJE and WCONINJH, as numpy
+        arrays.
+
+        Returns a dict with the axis 'wells' (names) and (wells x timesteps)
+        arrays, in SI units (m3/s and Pa):
+
+            production: 'oil_rate', 'water_rate', 'gas_rate', 'liquid_rate',
+                'resv_rate', 'bhp_limit', 'thp_limit', 'bhp_history',
+                'thp_history', 'prediction_mode' and 'control_mode'.
+            injection: 'surface_injection_rate', 'reservoir_injection_rate',
+                'injection_bhp_limit', 'injection_thp_limit',
+                'injection_prediction_mode', 'injection_control_mode' and
+                'injector_type'.
+
+        The modes and types hold the codes listed in 'control_codes',
+        'injection_control_codes' and 'injector_type_codes'. Production
+        values are NaN, and codes 0, where the well is not a producer, and
+        likewise for injection. For history matched wells (WCONHIST) the
+        rates are the observed rates, and prediction_mode is False. The
+        result is computed once per Schedule.
+        """
+        if self._controls is None:
+            self._controls = self._well_controls()
+        return self._controls
+
+    def completion_table(self):
+        """All completions of all wells over the whole schedule, as columns.
+
+        Returns a dict of equally long numpy arrays, one row per (well,
+        timestep, completion), with a column for every Completion property
+        plus 'well' (an index into 'wells') and 'timestep'. Rows are only
+        emitted for the timesteps where the completion set of a well changed,
+        so the completions of a well at timestep t are the rows of its latest
+        timestep <= t. A timestep where all completions of a well are removed
+        gets one marker row with number, I, J and K -1 and NaN values, so
+        rows with number -1 are not completions. 'state' and 'direction' hold
+        the codes listed in 'state_codes' and 'direction_codes'. The result is
+        computed once per Schedule.
+        """
+        if self._completions is None:
+            self._completions = self._completion_table()
+        return self._completions
+
+    def group_snapshots(self):
+        """The group tree and the group of every well over the whole schedule.
+
+        Returns a dict with the axes 'groups' (names) and 'wells' (names), the
+        per-timestep array 'snapshot' and the (snapshots x groups) arrays
+        'parent' and 'order' and (snapshots x wells) array 'well_group'. A
+        snapshot is stored once for every run of timesteps where neither the
+        tree nor the group of any well changed, and 'snapshot' maps every
+        timestep to its row. 'parent' and 'well_group' are indices into
+        'groups' (-1 for FIELD, groups not in the tree and undefined wells),
+        and 'order' lists the groups in the tree depth first from FIELD,
+        padded with -1. The result is computed once per Schedule.
+        """
+        if self._snapshots is None:
+            self._snapshots = self._group_snapshots()
+        return self._snapshots
+
+    def group_hierarchy(self, timestep=0):
+        """The GroupHierarchy at timestep, shared by all the timesteps where
+        the group tree and the groups of the wells are the same."""
+        snapshots = self.group_snapshots()
+        if not 0 <= timestep < len(snapshots['snapshot']):
+            raise IndexError('Timestep out of range')
+
+        if self._hierarchies is None:
+            self._hierarchies = [None] * len(snapshots['parent'])
+        row = snapshots['snapshot'][timestep]
+        if self._hierarchies[row] is None:
+            self._hierarchies[row] = GroupHierarchy(snapshots, row)
+        return self._hierarchies[row]
 
     def group(self, timestep=0):
         return {grp.name: grp for grp in self.groups(timestep)}
 
     def groups(self, timestep=0):
-        return [Group(x, self, timestep) for x in self._groups if x.name != 'FIELD']
+        names = self.group_snapshots()['groups']
+        return [Group(self._group(x), self, timestep) for x in names if x != 'FIELD']
 
     def __getitem__(self,well):
-         return Well(self._getwell(well))
+        if self._well_index is None:
+            self._cache_wells()
+        try:
+            return self._well_index[well]
+        except KeyError:
+            raise KeyError(well)
 
 
 @delegate(lib.Well)
@@ -107,6 +365,8 @@ class Completion(object):
 
 @delegate(lib.Group)
 class Group(object):
+    __slots__ = ('_schedule', 'timestep')
+
     def __init__(self, _, schedule, timestep):
 
         try:
@@ -115,7 +375,7 @@ class Group(object):
         except ValueError:
             raise ValueError('timestep must be int, not {}'.format(type(timestep)))
 
-        if not 0 <= timestep < len(schedule.timesteps):
+        if not 0 <= timestep < len(schedule.group_snapshots()['snapshot']):
             raise IndexError('Timestep out of range')
 
         self._schedule = schedule
@@ -124,23 +384,102 @@ class Group(object):
     def __getitem__(self, name):
         return Group(self._schedule._group(name), self._schedule, self.timestep)
 
+    @property
+    def _hierarchy(self):
+        return self._schedule.group_hierarchy(self.timestep)
+
     @property
     def wells(self):
-        names = self._wellnames(self.timestep)
-        return [w for w in self._schedule.wells if w.name in names]
+        return [self._schedule[w] for w in self._hierarchy.wells(self.name)]
+
+    @property
+    def subtree_wells(self):
+        """The wells of this group and of every group below it"""
+        return [self._schedule[w] for w in self._hierarchy.subtree_wells(self.name)]
 
     @property
     def parent(self):
-        par = self._schedule._group_tree(self.timestep)._parent(self.name)
-        if self.name == 'FIELD':
+        par = self._hierarchy.parent(self.name)
+        if par is None:
             return None
-        else:
-            return Group(self._schedule._group(par), self._schedule, self.timestep)
+        return self[par]
 
     @property
     def children(self):
-        chl = self._schedule._group_tree(self.timestep)._children(self.name)
-        g = lambda elt : Group(self._schedule._group(elt),
-                               self._schedule,
-                               self.timestep)
-        return [g(elem) for elem in chl]
+        return [self[elem] for elem in self._hierarchy.children(self.name)]
+
+
+class GroupHierarchy(object):
+    """The group tree, and the wells of every group, at one or more timesteps.
+
+    Built from a row of Schedule.group_snapshots() in one pass over the
+    groups and wells, after which every lookup is a dict lookup or a slice.
+    Use Schedule.group_hierarchy(timestep) rather than creating it directly.
+
+    Attributes:
+        groups (tuple): The names of the groups in the tree, depth first
+            from FIELD, so the groups below a group directly follow it.
+    """
+    __slots__ = ('groups', '_parent', '_children', '_wells', '_flat',
+                 '_subtree')
+
+    def __init__(self, snapshots, row):
+        names = snapshots['groups']
+        parents = snapshots['parent'][row].tolist()
+        order = [g for g in snapshots['order'][row].tolist() if g >= 0]
+
+        self.groups = tuple(names[g] for g in order)
+        self._parent = {}
+        children = {name: [] for name in self.groups}
+        for g in order:
+            if parents[g] >= 0:
+                self._parent[names[g]] = names[parents[g]]
+                children[names[parents[g]]].append(names[g])
+        self._children = {k: tuple(v) for k, v in children.items()}
+
+        wells = {}
+        groups = snapshots['well_group'][row].tolist()
+        for well, g in zip(snapshots['wells'], groups):
+            if g >= 0:
+                wells.setdefault(names[g], []).append(well)
+        self._wells = {k: tuple(v) for k, v in wells.items()}
+
+        # the wells in the order of their groups, so the wells below a group
+        # are the slice from its first well to the last well of its last child
+        flat, start, end = [], {}, {}
+        for name in self.groups:
+            start[name] = len(flat)
+            flat.extend(self.wells(name))
+        for name in reversed(self.groups):
+            below = self._children[name]
+            if below:
+                end[name] = end[below[-1]]
+            else:
+                end[name] = start[name] + len(self.wells(name))
+        self._flat = tuple(flat)
+        self._subtree = {name: (start[name], end[name]) for name in self.groups}
+
+    def __repr__(self):
+        return 'GroupHierarchy(groups: %d)' % len(self.groups)
+
+    def __contains__(self, name):
+        return name in self._children
+
+    def parent(self, name):
+        """The name of the parent of group name, None for FIELD"""
+        return self._parent.get(name)
+
+    def children(self, name):
+        """The names of the groups directly below group name"""
+        return self._children.get(name, ())
+
+    def wells(self, name):
+        """The names of the wells in group name"""
+        return self._wells.get(name, ())
+
+    def subtree_wells(self, name):
+        """The names of the wells in group name and every group below it"""
+        if name not in self._subtree:
+            return self.wells(name)
+        first, last = self._subtree[name]
+        return self._flat[first:last]
@@ -0,0 +1,172 @@
+"""Incremental parsing of decks that are edited one include file at a time.
+
+A ParseSession splits the deck lexically into chunks, like stream_deck, and
+parses every chunk on its own, with the RUNSPEC section in front. The deck is
+assembled from the parsed chunks. When files change, the deck is scanned
+again, and only chunks whose text changed are parsed again. The EclipseState
+sections (grid, tables, props, schedule) that do not depend on a changed deck
+section are kept, so editing a schedule include does not rebuild the grid and
+the properties.
+
+Each file must contain whole keywords, which is how INCLUDE is used in
+practice. A change to RUNSPEC parses the whole deck again.
+"""
+
+import json
+import os
+from os.path import abspath
+
+import libsunbeam as lib
+from .deck import Deck
+from .parser import _parse_context, _recoveries
+from .properties import LazyEclipseState, _measure
+from .stream import _skip_missing, chunks
+
+# The EclipseState sections built from the keywords of every deck section
+_affects = {
+    'RUNSPEC': LazyEclipseState.SECTIONS,
+    'GRID': ('grid', 'props'),
+    'EDIT': ('props',),
+    'PROPS': ('tables', 'props'),
+    'REGIONS': ('props',),
+    'SOLUTION': (),
+    'SUMMARY': (),
+    'SCHEDULE': ('schedule',),
+}
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+class ParseSession(object):
+    """A parsed deck that can be refreshed after its files are edited.
+
+    Args:
+        deck (str): Path to the deck file.
+        recovery ((str, action)|[(str, action)]): List of error recoveries,
+            see parse.
+        keywords (dict|[dict]): Keyword parser extensions, see parse_deck.
+
+    Attributes:
+        deck (Deck): The parsed deck.
+        state (LazyEclipseState): The EclipseState of deck, built lazily.
+        timings (dict): The time and peak RSS growth of scanning, parsing and
+            assembling the deck in the last (re)parse, and of building the
+            sections of state.
+
+    Example:
+        session = sunbeam.ParseSession('NORNE_ATW2013.DATA',
+            recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
+        wells = session.state.schedule.wells
+        # ... edit INCLUDE/BC0407_HIST01122006.SCH ...
+        session.refresh()
+        wells = session.state.schedule.wells  # grid and props are reused
+    """
+
+    def __init__(self, deck, recovery=[], keywords=[]):
+        if isinstance(keywords, dict):
+            keywords = [keywords]
+        recovery = _recoveries(recovery)
+
+        self.fname = deck
+        self._keywords = [json.dumps(kw) for kw in keywords]
+        self._context = _parse_context(recovery)
+        self._skip_missing = _skip_missing(recovery)
+
+        self._runspec = None
+        self._runspec_deck = None
+        self._nrunspec = 0
+        self._parsed = {}
+        self._layout = {}
+        self._files = {}
+
+        self.deck = None
+        self.state = None
+        self.timings = {}
+        self._load()
+
+    def __repr__(self):
+        return 'ParseSession(%s, files: %d)' % (self.fname, len(self._files))
+
+    @property
+    def files(self):
+        """The files of the deck"""
+        return sorted(self._files)
+
+    def _parse(self, text):
+        return lib.parse_deck(text, self._keywords, False, self._context)
+
+    def _parse_chunk(self, section, text):
+        if section == 'RUNSPEC':
+            return self._parse(text)
+        return self._parse(self._runspec + text)
+
+    def _load(self):
+        timings = {}
+        with _measure(timings, 'scan'):
+            scanned = list(chunks(self.fname, self._skip_missing))
+
+        runspec = ''.join(c.text for s, c in scanned if s == 'RUNSPEC')
+        if runspec != self._runspec:
+            self._runspec, self._parsed = runspec, {}
+            self._runspec_deck = self._parse(runspec)
+            self._nrunspec = len(self._runspec_deck)
+
+        layout = {}
+        for section, chunk in scanned:
+            layout.setdefault(section, []).append(chunk.text)
+        changed = [section for section in set(layout) | set(self._layout)
+                   if layout.get(section) != self._layout.get(section)]
+
+        with _measure(timings, 'parse'):
+            parsed = {}
+            for section, chunk in scanned:
+                key = (section, chunk.text)
+                if key in parsed:
+                    continue
+                if key in self._parsed:
+                    parsed[key] = self._parsed[key]
+                else:
+                    parsed[key] = self._parse_chunk(section, chunk.text)
+
+        with _measure(timings, 'assemble'):
+            deck = lib.Deck()
+            deck._set_data_file(abspath(self.fname))
+            deck._copy_units(self._runspec_deck)
+            for section, chunk in scanned:
+                skip = 0 if section == 'RUNSPEC' else self._nrunspec
+                deck._extend(parsed[(section, chunk.text)], skip)
+
+        if self.state is None:
+            self.state = LazyEclipseState(deck, self._context, timings=timings)
+        else:
+            stale = set()
+            for section in changed:
+                stale.update(_affects[section])
+            self.state = self.state._update(deck, stale, timings)
+
+        self.deck = Deck(deck)
+        self.timings = timings
+        self._parsed = parsed
+        self._layout = layout
+        self._files = {c.path: _stat(c.path) for _, c in scanned}
+
+    def refresh(self):
+        """Parse the deck again if any of its files changed.
+
+        Only the parts of the deck in changed files are parsed again, and only
+        the state sections that depend on them are rebuilt, on first access.
+
+        Returns the paths of the files that changed since the last parse, and
+        an empty list if none did.
+        """
+        changed = sorted(path for path, stat in self._files.items()
+                         if _stat(path) != stat)
+        if changed:
+            self._load()
+        return changed
@@ -0,0 +1,135 @@
+"""Streaming keyword access to large decks.
+
+opm-parser only parses whole decks, so streaming is done by splitting the deck
+lexically into chunks: contiguous text from one file within one section. Only
+the chunks the caller asks for are parsed, one at a time, each with the
+RUNSPEC section in front so that keyword sizes (TABDIMS, WELLDIMS ...) are
+known. Chunks that are skipped are never parsed. When names are given, only
+the requested keywords of a parsed chunk are kept, copied into a deck of
+their own, and the chunk is freed before any keyword is yielded. Memory is therefore bounded by the
+requested keywords, plus the one chunk being parsed, rather than by the deck.
+"""
+
+import json
+import re
+from os.path import isfile
+
+import libsunbeam as lib
+from .includes import Segment, segments
+from .parser import _parse_context, _recoveries
+
+SECTIONS = ('RUNSPEC', 'GRID', 'EDIT', 'PROPS', 'REGIONS', 'SOLUTION',
+            'SUMMARY', 'SCHEDULE')
+
+# a keyword is alone on its line, apart from a trailing comment
+_keyword_line = r'^[ \t]*(%s)[ \t]*(?:--[^\n]*)?\r?$'
+_section = re.compile(_keyword_line % '|'.join(SECTIONS), re.M)
+
+
+def _names(names):
+    return re.compile(_keyword_line % '|'.join(map(re.escape, names)), re.M)
+
+
+def _skip_missing(recovery):
+    """True if recovery does not throw on missing include files"""
+    return any(key == 'PARSE_MISSING_INCLUDE' and action != lib.action.throw
+               for key, action in recovery)
+
+
+def chunks(deck, skip_missing=False):
+    """Yield (section, Segment) for the deck in file deck, in deck order.
+
+    Text before the first section keyword is reported as RUNSPEC. Missing
+    include files raise IOError unless skip_missing is True.
+    """
+    if isfile(deck):
+        segs = segments(deck, skip_missing)
+    else:
+        segs = [Segment(None, 1, deck)]
+
+    section = 'RUNSPEC'
+    for seg in segs:
+        start, line = 0, seg.first_line
+        for match in _section.finditer(seg.text):
+            if match.group(1) == section:
+                continue
+            if match.start() > start:
+                text = seg.text[start:match.start()]
+                yield section, Segment(seg.path, line, text)
+                line += text.count('\n')
+            section, start = match.group(1), match.start()
+        if start < len(seg.text):
+            yield section, Segment(seg.path, line, seg.text[start:])
+
+
+def stream_deck(deck, names=None, sections=None, keywords=[], recovery=[]):
+    """Yield the keywords of a deck without holding the whole deck in memory.
+
+    Args:
+        deck (str): Either an eclipse deck string or path to a file to open.
+        names ([str]): Only yield keywords with these names. An empty list
+            yields nothing, without parsing.
+        sections ([str]): Only yield keywords from these sections, any of
+            RUNSPEC, GRID, EDIT, PROPS, REGIONS, SOLUTION, SUMMARY, SCHEDULE.
+            Keywords before the first section keyword count as RUNSPEC.
+        keywords (dict|[dict]): Keyword parser extensions, see parse_deck.
+        recovery ((str, action)|[(str, action)]): List of error recoveries,
+            see parse_deck.
+
+    Example:
+        Count the wells opened in the SCHEDULE section of Norne.
+            for kw in sunbeam.stream_deck('NORNE_ATW2013.DATA',
+                                          names=['WELSPECS'],
+                                          sections=['SCHEDULE']):
+                print(len(kw))
+
+    :rtype: Iterator[sunbeam.libsunbeam.DeckKeyword]
+    """
+    if isinstance(keywords, dict):
+        keywords = [keywords]
+    keywords = [json.dumps(kw) for kw in keywords]
+    recovery = _recoveries(recovery)
+    ctx = _parse_context(recovery)
+    skip_missing = _skip_missing(recovery)
+
+    if sections is not None:
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ValueError('Unknown sections: %s' % ', '.join(sorted(unknown)))
+    if names is not None:
+        names = list(names)
+        if not names:
+            return  # an empty alternation would match every blank line
+    wanted = _names(names) if names is not None else None
+
+    runspec = ''
+    nrunspec = None
+
+    for section, chunk in chunks(deck, skip_missing):
+        if section == 'RUNSPEC':
+            runspec += chunk.text
+        elif nrunspec is None:
+            nrunspec = len(lib.parse_deck(runspec, keywords, False, ctx))
+
+        if sections is not None and section not in sections:
+            continue
+        if wanted is not None and not wanted.search(chunk.text):
+            continue
+
+        if section == 'RUNSPEC':
+            parsed, skip = lib.parse_deck(chunk.text, keywords, False, ctx), 0
+        else:
+            parsed = lib.parse_deck(runspec + chunk.text, keywords, False, ctx)
+            skip = nrunspec
+
+        if names is None:
+            for index in range(skip, len(parsed)):
+                yield parsed[index]
+            del parsed
+            continue
+
+        kept = lib.Deck()
+        kept._select(parsed, skip, names)
+        del parsed
+        for kw in kept:
+            yield kw
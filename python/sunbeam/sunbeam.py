@@ -1,3 +1,5 @@
+import operator
+import weakref
 import libsunbeam as lib
 
 class _delegate(object):
@@ -18,26 +20,90 @@ class _delegate(object):
     def __repr__(self):
         return '_delegate(' + repr(self._name) + ", " + repr(self._attr) + ")"
 
+# attributes of the wrapped class that belong to the type itself
+_internal = frozenset(['__init__', '__new__', '__dict__', '__weakref__',
+                       '__module__', '__doc__', '__slots__', '__qualname__'])
+
+def _forward(to, name, attr):
+    """A class attribute forwarding name to the wrapped object.
+
+    Methods and properties of the wrapped class are looked up once, here, so
+    that a call through the wrapper is a single call of the C++ function.
+    Anything else is looked up on every access by a _delegate.
+    """
+    this = operator.attrgetter(to)
+
+    if isinstance(attr, property):
+        fget, fset = attr.fget, attr.fset
+        getter = lambda self: fget(this(self))
+        setter = None
+        if fset is not None:
+            setter = lambda self, value: fset(this(self), value)
+        return property(getter, setter, doc=attr.__doc__)
+
+    if callable(attr):
+        def method(self, *args, **kwargs):
+            return attr(this(self), *args, **kwargs)
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    return _delegate(to, name)
+
+class _Cached(type):
+    """Metaclass of delegate wrappers, returning the existing wrapper of an
+    object while it is alive. __init__ only runs for new wrappers, so a
+    wrapper other callers hold is never re-initialized."""
+
+    def __call__(cls, this, *args, **kwargs):
+        key = (id(this),) + args + tuple(sorted(kwargs.items()))
+        try:
+            new = cls._wrappers.get(key)
+        except TypeError: # unhashable arguments are not cached
+            return type.__call__(cls, this, *args, **kwargs)
+        if new is None:
+            new = type.__call__(cls, this, *args, **kwargs)
+            cls._wrappers[key] = new
+        return new
+
 def delegate(delegate_cls, to = '_sun'):
-    attributes = set(delegate_cls.__dict__.keys())
+    """Make cls a wrapper of delegate_cls, forwarding every attribute cls does
+    not define itself to the wrapped object in the attribute to.
+
+    The wrapper class is rebuilt with __slots__ and has no __dict__.
+    Attributes the wrapper keeps itself must be listed in the __slots__ of
+    cls, and start out as None; setting any other attribute on a wrapper
+    raises AttributeError.
+
+    Wrappers are cached: wrapping the same object with the same arguments
+    returns the same wrapper for as long as it is alive, and __init__ of cls
+    only runs when the wrapper is created.
+    """
 
     def inner(cls):
-        class _property(object):
-            pass
+        own = cls.__dict__.get('__slots__', ())
+        if isinstance(own, str):
+            own = (own,)
+        own = tuple(own)
+
+        namespace = dict((k, v) for k, v in cls.__dict__.items()
+                         if k not in own and k not in ('__dict__', '__weakref__'))
+        for name, attr in delegate_cls.__dict__.items():
+            if name in namespace or name in own or name in _internal:
+                continue
+            namespace[name] = _forward(to, name, attr)
 
-        setattr(cls, to, _property())
-        for attr in attributes - set(cls.__dict__.keys() + ['__init__']):
-            setattr(cls, attr, _delegate(to, attr))
-            src, dst = getattr(delegate_cls, attr), getattr(cls, attr)
-            setattr(dst, '__doc__', src.__doc__)
+        namespace['__slots__'] = (to, '__weakref__') + own
+        namespace['_wrappers'] = weakref.WeakValueDictionary()
 
         def new__new__(_cls, this, *args, **kwargs):
-            new = super(cls, _cls).__new__(_cls, *args, **kwargs)
+            new = object.__new__(_cls)
             setattr(new, to, this)  # self._sun = this
+            for name in own:
+                setattr(new, name, None)
             return new
 
-        cls.__new__ = staticmethod(new__new__)
-
-        return cls
+        namespace['__new__'] = staticmethod(new__new__)
+        return _Cached(cls.__name__, cls.__bases__, namespace)
 
     return inner
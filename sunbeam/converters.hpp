@@ -2,7 +2,9 @@
 #define SUNBEAM_CONVERTERS_HPP
 
 #include <sstream>
+#include <vector>
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 
 namespace py = pybind11;
 
@@ -13,6 +15,25 @@ py::list iterable_to_pylist( const T& v ) {
     return l;
 }
 
+/*
+  Wrap the storage of v in a numpy array without copying. The array does not
+  own the memory, it holds a reference to base instead, and base must be the
+  python object that keeps v alive. The storage belongs to the C++ object, so
+  the array is flagged read-only.
+*/
+template< typename T >
+py::array_t< T > readonly_array( const std::vector< T >& v, py::handle base ) {
+    py::array_t< T > a( v.size(), v.data(), base );
+    a.attr( "setflags" )( py::arg( "write" ) = false );
+    return a;
+}
+
+/* An uninitialized, C-ordered rows x cols numpy array */
+template< typename T >
+py::array_t< T > matrix( size_t rows, size_t cols ) {
+    return py::array_t< T >( std::vector< size_t >{ rows, cols } );
+}
+
 template< typename T >
 std::string str( const T& t ) {
     std::stringstream stream;
@@ -1,6 +1,10 @@
 #include <opm/parser/eclipse/Deck/Deck.hpp>
+#include <opm/parser/eclipse/Units/UnitSystem.hpp>
+
+#include <set>
 
 #include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
 #include "converters.hpp"
 #include "sunbeam.hpp"
 
@@ -34,12 +38,55 @@ namespace {
         return deck.getKeyword(index);
     }
 
+    /*
+      (name, filename, line number) of every keyword, in deck order.
+    */
+    py::list keyword_locations( const Deck& deck ) {
+        py::list locations;
+        for( const auto& kw : deck )
+            locations.append( py::make_tuple( kw.name(),
+                                              kw.getFileName(),
+                                              kw.getLineNumber() ) );
+        return locations;
+    }
+
+    void extend( Deck& deck, const Deck& other, size_t first ) {
+        for( size_t i = first; i < other.size(); ++i )
+            deck.addKeyword( other.getKeyword( i ) );
+    }
+
+    void select( Deck& deck, const Deck& other, size_t first,
+                 const std::vector< std::string >& names ) {
+        const std::set< std::string > wanted( names.begin(), names.end() );
+        for( size_t i = first; i < other.size(); ++i ) {
+            const auto& kw = other.getKeyword( i );
+            if( wanted.count( kw.name() ) )
+                deck.addKeyword( kw );
+        }
+    }
+
+    /*
+      The unit system is chosen by the parser from FIELD, LAB or METRIC in
+      RUNSPEC, and is not carried over by extend.
+    */
+    void copy_units( Deck& deck, const Deck& other ) {
+        deck.selectActiveUnitSystem( other.getActiveUnitSystem().getType() );
+    }
+
+    py::list keyword_names( const Deck& deck ) {
+        py::list names;
+        for( const auto& kw : deck )
+            names.append( kw.name() );
+        return names;
+    }
+
 
 }
 
 void sunbeam::export_Deck(py::module &module) {
 
     py::class_< Deck >(module, "Deck")
+        .def( py::init<>() )
         .def( "__len__", &size )
         .def( "__contains__", &hasKeyword )
         .def("__iter__",
@@ -49,6 +96,12 @@ void sunbeam::export_Deck(py::module &module) {
         .def( "__getitem__", &getKeyword_tuple, ref_internal)
         .def( "__str__", &str<Deck>)
         .def( "count", &count )
+        .def( "_names", &keyword_names )
+        .def( "_locations", &keyword_locations )
+        .def( "_extend", &extend )
+        .def( "_select", &select )
+        .def( "_copy_units", &copy_units )
+        .def( "_set_data_file", &Deck::setDataFile )
       ;
 }
 
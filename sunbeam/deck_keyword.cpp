@@ -35,6 +35,37 @@ py::list item_to_pylist( const DeckItem& item )
     }
 }
 
+/*
+  The data of an integer or double item as a read-only numpy array sharing
+  memory with the item. base is the python object keeping the item alive.
+  Double items are in the units of the deck, or in SI units if si is true.
+*/
+py::array item_to_pyarray( const DeckItem& item, py::handle base, bool si )
+{
+    switch (item.getType())
+    {
+    case type_tag::integer:
+        return readonly_array( item.getData< int >(), base );
+    case type_tag::fdouble:
+        if (si)
+            return readonly_array( item.getSIDoubleData(), base );
+        return readonly_array( item.getData< double >(), base );
+    case type_tag::string:
+        throw py::type_error( "String item " + item.name() + " has no array form." );
+    default:
+        throw std::logic_error( "Type not set." );
+    }
+}
+
+py::array_t< bool > item_defaulted( const DeckItem& item )
+{
+    py::array_t< bool > mask( item.size() );
+    auto* out = mask.mutable_data();
+    for (size_t i = 0; i < item.size(); ++i)
+        out[i] = item.defaultApplied( i );
+    return mask;
+}
+
 struct DeckRecordIterator
 {
     DeckRecordIterator(const DeckRecord* record) {
@@ -64,6 +95,8 @@ void sunbeam::export_DeckKeyword(py::module& module) {
         .def( "__getitem__", getRecord, ref_internal)
         .def( "__len__", &DeckKeyword::size )
         .def_property_readonly("name", &DeckKeyword::name )
+        .def_property_readonly("filename", &DeckKeyword::getFileName )
+        .def_property_readonly("line_number", &DeckKeyword::getLineNumber )
         ;
 
 
@@ -79,6 +112,20 @@ void sunbeam::export_DeckKeyword(py::module& module) {
             return item_to_pylist( record.getItem(name) );
         })
         .def( "__len__", &DeckRecord::size )
+        .def( "array", +[](py::object self, size_t index, bool si){
+            const auto& record = self.cast< const DeckRecord& >();
+            return item_to_pyarray( record.getItem(index), self, si );
+        }, py::arg("index"), py::arg("si") = false )
+        .def( "array", +[](py::object self, const std::string& name, bool si){
+            const auto& record = self.cast< const DeckRecord& >();
+            return item_to_pyarray( record.getItem(name), self, si );
+        }, py::arg("name"), py::arg("si") = false )
+        .def( "defaulted", +[](const DeckRecord& record, size_t index){
+            return item_defaulted( record.getItem(index) );
+        })
+        .def( "defaulted", +[](const DeckRecord& record, const std::string& name){
+            return item_defaulted( record.getItem(name) );
+        })
         ;
 
 
@@ -1,11 +1,27 @@
+#include <opm/parser/eclipse/Deck/Deck.hpp>
 #include <opm/parser/eclipse/EclipseState/Eclipse3DProperties.hpp>
+#include <opm/parser/eclipse/EclipseState/Grid/EclipseGrid.hpp>
+#include <opm/parser/eclipse/EclipseState/Tables/TableManager.hpp>
 #include <pybind11/stl.h>
 
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <map>
+#include <string>
+
 #include "sunbeam.hpp"
 #include "converters.hpp"
 
 namespace {
 
+    Eclipse3DProperties * fromDeck( const Deck& deck,
+                                    const TableManager& tables,
+                                    const EclipseGrid& grid ) {
+        py::gil_scoped_release release;
+        return new Eclipse3DProperties( deck, tables, grid );
+    }
+
     py::list getitem( const Eclipse3DProperties& p, const std::string& kw) {
         const auto& ip = p.getIntProperties();
         if (ip.supportsKeyword(kw) && ip.hasKeyword(kw))
@@ -19,6 +35,20 @@ namespace {
         throw py::key_error( "no such grid property " + kw );
     }
 
+    py::array getarray( py::object self, const std::string& kw ) {
+        const auto& p = self.cast< const Eclipse3DProperties& >();
+
+        const auto& ip = p.getIntProperties();
+        if (ip.supportsKeyword(kw) && ip.hasKeyword(kw))
+            return readonly_array(p.getIntGridProperty(kw).getData(), self);
+
+        const auto& dp = p.getDoubleProperties();
+        if (dp.supportsKeyword(kw) && dp.hasKeyword(kw))
+            return readonly_array(p.getDoubleGridProperty(kw).getData(), self);
+
+        throw py::key_error( "no such grid property " + kw );
+    }
+
     bool contains( const Eclipse3DProperties& p, const std::string& kw) {
         return
             (p.getIntProperties().supportsKeyword(kw) &&
@@ -33,14 +63,146 @@ namespace {
         return p.getRegions(kw);
     }
 
+    template< typename T >
+    using carray = py::array_t< T, py::array::c_style | py::array::forcecast >;
+
+    struct RegionAcc {
+        std::int64_t count = 0;
+        double sum = 0;
+        double min = std::numeric_limits< double >::infinity();
+        double max = -std::numeric_limits< double >::infinity();
+        double wsum = 0;
+        double weight = 0;
+    };
+
+    /*
+      Region ids of a wider integer type than int, rejected unless every id
+      fits, rather than wrapped by a cast.
+    */
+    template< typename T >
+    carray< int > narrow_regions( py::array region_ids ) {
+        const auto wide = region_ids.cast< carray< T > >();
+        const auto* src = wide.data();
+        const size_t n = wide.size();
+
+        carray< int > regions( n );
+        auto* dst = regions.mutable_data();
+        for( size_t i = 0; i < n; ++i ) {
+            if( src[ i ] < T( 0 ) || src[ i ] > T( std::numeric_limits< int >::max() ) )
+                throw py::value_error( "region id " + std::to_string( src[ i ] )
+                                       + " is out of range" );
+            dst[ i ] = int( src[ i ] );
+        }
+        return regions;
+    }
+
+    /*
+      Reduce values per region id in a single pass over the cells where mask
+      is set. Only regions with at least one cell are reported, in increasing
+      region id order. The regions must be integers, ids wider than int must
+      fit in an int, and they are kept in a map so
+      that sparse ids like 1 and 2000000000 cost two entries, not a dense
+      vector of the largest id.
+    */
+    py::dict regionStats( py::array region_ids,
+                          carray< double > values,
+                          carray< double > weights,
+                          carray< bool > mask ) {
+        const auto kind = region_ids.dtype().attr( "kind" ).cast< std::string >();
+        if( kind != "i" && kind != "u" )
+            throw py::type_error( "regions must be an integer array, not "
+                                  + py::str( region_ids.dtype() ).cast< std::string >() );
+
+        const bool fits = region_ids.itemsize() < 4
+                       || ( kind == "i" && region_ids.itemsize() == 4 );
+        const auto regions = fits ? region_ids.cast< carray< int > >()
+                           : kind == "u" ? narrow_regions< std::uint64_t >( region_ids )
+                           : narrow_regions< std::int64_t >( region_ids );
+        const size_t n = regions.size();
+        if( values.size() != n || weights.size() != n || mask.size() != n )
+            throw py::value_error( "regions, values, weights and mask must have the same size" );
+
+        const auto* reg = regions.data();
+        const auto* val = values.data();
+        const auto* wgt = weights.data();
+        const auto* msk = mask.data();
+
+        std::map< int, RegionAcc > acc;
+        {
+            py::gil_scoped_release release;
+            /* region ids come in long runs, so the last lookup is reused */
+            auto it = acc.end();
+            for( size_t i = 0; i < n; ++i ) {
+                if( !msk[ i ] ) continue;
+                if( reg[ i ] < 0 )
+                    throw std::invalid_argument( "negative region id " + std::to_string( reg[ i ] ) );
+
+                if( it == acc.end() || it->first != reg[ i ] )
+                    it = acc.emplace( reg[ i ], RegionAcc() ).first;
+
+                auto& a = it->second;
+                a.count += 1;
+                a.sum += val[ i ];
+                a.min = std::min( a.min, val[ i ] );
+                a.max = std::max( a.max, val[ i ] );
+                a.wsum += wgt[ i ] * val[ i ];
+                a.weight += wgt[ i ];
+            }
+        }
+
+        const size_t nreg = acc.size();
+
+        py::array_t< int > region( nreg );
+        py::array_t< std::int64_t > count( nreg );
+        py::array_t< double > sum( nreg ), mean( nreg ), min( nreg ), max( nreg );
+        py::array_t< double > weighted_mean( nreg );
+
+        auto* region_ = region.mutable_data();
+        auto* count_  = count.mutable_data();
+        auto* sum_    = sum.mutable_data();
+        auto* mean_   = mean.mutable_data();
+        auto* min_    = min.mutable_data();
+        auto* max_    = max.mutable_data();
+        auto* wmean_  = weighted_mean.mutable_data();
+
+        size_t j = 0;
+        for( const auto& entry : acc ) {
+            const auto& a = entry.second;
+            region_[ j ] = entry.first;
+            count_[ j ]  = a.count;
+            sum_[ j ]    = a.sum;
+            mean_[ j ]   = a.sum / a.count;
+            min_[ j ]    = a.min;
+            max_[ j ]    = a.max;
+            wmean_[ j ]  = a.weight != 0 ? a.wsum / a.weight
+                                         : std::numeric_limits< double >::quiet_NaN();
+            ++j;
+        }
+
+        py::dict d;
+        d["region"]        = region;
+        d["count"]         = count;
+        d["sum"]           = sum;
+        d["mean"]          = mean;
+        d["min"]           = min;
+        d["max"]           = max;
+        d["weighted_mean"] = weighted_mean;
+        return d;
+    }
+
 }
 
 void sunbeam::export_Eclipse3DProperties(py::module& module) {
 
   py::class_< Eclipse3DProperties >( module, "Eclipse3DProperties") 
+    .def( py::init( &fromDeck ), py::keep_alive< 1, 3 >(), py::keep_alive< 1, 4 >() )
     .def( "getRegions",   &regions )
     .def( "__contains__", &contains )
     .def( "__getitem__",  &getitem )
+    .def( "array",        &getarray, "read-only numpy view of a grid property,"
+                                     " sharing memory with the C++ storage" )
     ;
 
+  module.def( "_region_stats", &regionStats );
+
 }
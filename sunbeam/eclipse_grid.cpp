@@ -1,3 +1,5 @@
+#include <opm/parser/eclipse/Deck/Deck.hpp>
+#include <opm/parser/eclipse/EclipseState/Eclipse3DProperties.hpp>
 #include <opm/parser/eclipse/EclipseState/Grid/EclipseGrid.hpp>
 #include <opm/parser/eclipse/EclipseState/Grid/FaultCollection.hpp>
 #include <opm/parser/eclipse/EclipseState/Grid/FaultFace.hpp>
@@ -5,9 +7,15 @@
 #include <opm/parser/eclipse/EclipseState/Grid/FaceDir.hpp>
 
 #include "sunbeam.hpp"
+#include "converters.hpp"
 
 
 namespace {
+    EclipseGrid * fromDeck( const Deck& deck ) {
+        py::gil_scoped_release release;
+        return new EclipseGrid( deck );
+    }
+
     py::tuple getXYZ( const EclipseGrid& grid ) {
         return py::make_tuple( grid.getNX(),
                                grid.getNY(),
@@ -39,11 +47,85 @@ namespace {
       return grid.getCellVolume(i_idx, j_idx, k_idx);
     }
 
+    /*
+      The bulk accessors below compute a quantity for every cell (or every
+      active cell) in a single pass, instead of one python -> C++ round trip
+      per cell.
+    */
+    size_t cellCount( const EclipseGrid& grid, bool active_only ) {
+        return active_only ? grid.getNumActive() : grid.getCartesianSize();
+    }
+
+    template< typename T, typename F >
+    py::array_t< T > cellwise( const EclipseGrid& grid, bool active_only, F f ) {
+        py::array_t< T > a( cellCount( grid, active_only ) );
+        auto* out = a.mutable_data();
+        for( size_t g = 0; g < grid.getCartesianSize(); ++g ) {
+            if( active_only && !grid.cellActive( g ) ) continue;
+            *out++ = f( g );
+        }
+        return a;
+    }
+
+    py::array_t< double > cellVolumes( const EclipseGrid& grid, bool active_only ) {
+        return cellwise< double >( grid, active_only,
+                [&grid]( size_t g ) { return grid.getCellVolume( g ); } );
+    }
+
+    py::array_t< double > cellDepths( const EclipseGrid& grid, bool active_only ) {
+        return cellwise< double >( grid, active_only,
+                [&grid]( size_t g ) { return grid.getCellDepth( g ); } );
+    }
+
+    py::array_t< bool > activeMask( const EclipseGrid& grid ) {
+        return cellwise< bool >( grid, false,
+                [&grid]( size_t g ) { return grid.cellActive( g ); } );
+    }
+
+    py::array_t< int > activeToGlobal( const EclipseGrid& grid ) {
+        return cellwise< int >( grid, true,
+                []( size_t g ) { return int( g ); } );
+    }
+
+    py::array_t< int > globalToActive( const EclipseGrid& grid ) {
+        int active_index = 0;
+        return cellwise< int >( grid, false,
+                [&grid, &active_index]( size_t g ) {
+                    return grid.cellActive( g ) ? active_index++ : -1;
+                } );
+    }
+
+    /* flat (i0, j0, k0, i1, j1, k1, ...), reshaped to (n, 3) in python */
+    py::array_t< int > IJKs( const EclipseGrid& grid, bool active_only ) {
+        py::array_t< int > a( 3 * cellCount( grid, active_only ) );
+        auto* out = a.mutable_data();
+        for( size_t g = 0; g < grid.getCartesianSize(); ++g ) {
+            if( active_only && !grid.cellActive( g ) ) continue;
+            const auto ijk = grid.getIJK( g );
+            *out++ = ijk[0];
+            *out++ = ijk[1];
+            *out++ = ijk[2];
+        }
+        return a;
+    }
+
+    /*
+      EclipseState gives its grid the ACTNUM of the processed properties,
+      which EQUALS, MULTIPLY and the like may have changed. Like EclipseState
+      this is only done when the properties hold ACTNUM, as asking for it
+      otherwise creates an all active default.
+    */
+    void resetACTNUM( EclipseGrid& grid, const Eclipse3DProperties& props ) {
+        if( !props.hasDeckIntGridProperty( "ACTNUM" ) ) return;
+        grid.resetACTNUM( props.getIntGridProperty( "ACTNUM" ).getData().data() );
+    }
+
 }
 
 void sunbeam::export_EclipseGrid(py::module& module) {
 
     py::class_< EclipseGrid >( module, "EclipseGrid")
+        .def( py::init( &fromDeck ) )
         .def( "_getXYZ",        &getXYZ )
         .def( "nactive",        &getNumActive )
         .def( "cartesianSize",  &getCartesianSize )
@@ -51,6 +133,13 @@ void sunbeam::export_EclipseGrid(py::module& module) {
         .def( "getIJK",         &getIJK )
         .def( "_cellVolume1G",  &cellVolume1G)
         .def( "_cellVolume3",   &cellVolume3)
+        .def( "_cellVolumes",   &cellVolumes )
+        .def( "_cellDepths",    &cellDepths )
+        .def( "_IJKs",          &IJKs )
+        .def( "activeMask",     &activeMask )
+        .def( "activeToGlobal", &activeToGlobal )
+        .def( "globalToActive", &globalToActive )
+        .def( "_reset_actnum",  &resetACTNUM )
       ;
 
 }
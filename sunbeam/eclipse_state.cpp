@@ -1,11 +1,21 @@
+#include <opm/parser/eclipse/Deck/Deck.hpp>
 #include <opm/parser/eclipse/EclipseState/EclipseState.hpp>
 #include <opm/parser/eclipse/EclipseState/Grid/FaultCollection.hpp>
 
+#include <cstdint>
+#include <iterator>
+
 #include "sunbeam.hpp"
+#include "converters.hpp"
 
 
 namespace {
 
+    EclipseState * fromDeck( const Deck& deck, const ParseContext& context ) {
+        py::gil_scoped_release release;
+        return new EclipseState( deck, context );
+    }
+
     py::list getNNC( const EclipseState& state ) {
         py::list l;
         for( const auto& x : state.getInputNNC().nncdata() )
@@ -13,6 +23,28 @@ namespace {
         return l;
     }
 
+    py::dict nncArrays( const EclipseState& state ) {
+        const auto& nncs = state.getInputNNC().nncdata();
+        const size_t n = nncs.size();
+        py::array_t< int > cell1( n ), cell2( n );
+        py::array_t< double > trans( n );
+
+        auto* cell1_ = cell1.mutable_data();
+        auto* cell2_ = cell2.mutable_data();
+        auto* trans_ = trans.mutable_data();
+        for( size_t i = 0; i < n; ++i ) {
+            cell1_[ i ] = nncs[ i ].cell1;
+            cell2_[ i ] = nncs[ i ].cell2;
+            trans_[ i ] = nncs[ i ].trans;
+        }
+
+        py::dict d;
+        d["cell1"] = cell1;
+        d["cell2"] = cell2;
+        d["trans"] = trans;
+        return d;
+    }
+
     py::list faultNames( const EclipseState& state ) {
         py::list l;
         const auto& fc = state.getFaults();
@@ -67,6 +99,85 @@ namespace {
       return "Unknown direction";
     }
 
+    std::int8_t faceCode( FaceDir::DirEnum dir ) {
+      switch (dir) {
+      case FaceDir::DirEnum::XPlus:  return 0;
+      case FaceDir::DirEnum::XMinus: return 1;
+      case FaceDir::DirEnum::YPlus:  return 2;
+      case FaceDir::DirEnum::YMinus: return 3;
+      case FaceDir::DirEnum::ZPlus:  return 4;
+      case FaceDir::DirEnum::ZMinus: return 5;
+      }
+      return -1;
+    }
+
+    /*
+      Every face of every fault as columns, one row per (fault, cell, face),
+      in the order of faultNames and faultFaces.
+    */
+    py::dict faultTable( const EclipseState& state ) {
+        const auto& gr = state.getInputGrid();
+        const auto& fc = state.getFaults();
+        const size_t nx = gr.getNX();
+        const size_t ny = gr.getNY();
+
+        size_t n = 0;
+        for (size_t f = 0; f < fc.size(); f++)
+            for (const auto& ff : fc.getFault(f))
+                n += std::distance(ff.begin(), ff.end());
+
+        py::array_t< int > fault( n ), global( n ), I( n ), J( n ), K( n );
+        py::array_t< std::int8_t > face( n );
+        py::array_t< double > multiplier( fc.size() );
+        py::list names;
+
+        auto* fault_  = fault.mutable_data();
+        auto* global_ = global.mutable_data();
+        auto* I_      = I.mutable_data();
+        auto* J_      = J.mutable_data();
+        auto* K_      = K.mutable_data();
+        auto* face_   = face.mutable_data();
+        auto* mult_   = multiplier.mutable_data();
+
+        size_t row = 0;
+        for (size_t f = 0; f < fc.size(); f++) {
+            const auto& flt = fc.getFault(f);
+            names.append(flt.getName());
+            mult_[f] = flt.getTransMult();
+
+            for (const auto& ff : flt) {
+                const auto code = faceCode(ff.getDir());
+                for (size_t g : ff) {
+                    fault_[row]  = f;
+                    global_[row] = g;
+                    I_[row]      = g % nx;
+                    J_[row]      = (g / nx) % ny;
+                    K_[row]      = g / (nx * ny);
+                    face_[row]   = code;
+                    ++row;
+                }
+            }
+        }
+
+        py::dict face_codes;
+        for (const auto dir : { FaceDir::DirEnum::XPlus, FaceDir::DirEnum::XMinus,
+                                FaceDir::DirEnum::YPlus, FaceDir::DirEnum::YMinus,
+                                FaceDir::DirEnum::ZPlus, FaceDir::DirEnum::ZMinus })
+            face_codes[ py::str( faceDir( dir ) ) ] = int( faceCode( dir ) );
+
+        py::dict table;
+        table["faults"]       = names;
+        table["fault"]        = fault;
+        table["global_index"] = global;
+        table["i"]            = I;
+        table["j"]            = J;
+        table["k"]            = K;
+        table["face"]         = face;
+        table["face_codes"]   = face_codes;
+        table["multiplier"]   = multiplier;
+        return table;
+    }
+
     py::list faultFaces( const EclipseState& state, const std::string& name ) {
         py::list l;
         const auto& gr = state.getInputGrid(); // used for global -> IJK
@@ -88,6 +199,7 @@ namespace {
 void sunbeam::export_EclipseState(py::module& module) {
 
     py::class_< EclipseState >( module, "EclipseState" )
+        .def( py::init( &fromDeck ) )
         .def_property_readonly( "title", &EclipseState::getTitle )
         .def( "_schedule",      &EclipseState::getSchedule, ref_internal)
         .def( "_props",         &EclipseState::get3DProperties, ref_internal)
@@ -98,8 +210,10 @@ void sunbeam::export_EclipseState(py::module& module) {
         .def( "simulation",     &EclipseState::getSimulationConfig, ref_internal)
         .def( "summary",        &EclipseState::getSummaryConfig, ref_internal)
         .def( "input_nnc",      &getNNC )
+        .def( "_nnc_arrays",    &nncArrays )
         .def( "faultNames",     &faultNames )
         .def( "faultFaces",     &faultFaces )
+        .def( "_fault_table",   &faultTable )
         .def( "jfunc",          &jfunc )
         ;
 
@@ -9,10 +9,17 @@
 
 namespace {
 
+    /*
+      The parse functions do not touch any python objects, and release the GIL
+      for the full duration of the parse and the EclipseState construction, so
+      that other python threads can run while a deck is being parsed.
+    */
+
     Deck parseDeck( const std::string& deckStr,
                     const std::vector<std::string>& keywords,
                     bool isFile,
                     const ParseContext& pc ) {
+        py::gil_scoped_release release;
         Parser p;
         for (const auto& keyword : keywords) {
             const Json::JsonObject jkw(keyword);
@@ -22,12 +29,14 @@ namespace {
     }
 
     EclipseState * parse(const std::string& filename, const ParseContext& context) {
+        py::gil_scoped_release release;
         Parser p;
         const auto deck = p.parseFile(filename, context);
         return new EclipseState(deck,context);
     }
 
     EclipseState * parseData(const std::string& deckStr, const ParseContext& context) {
+        py::gil_scoped_release release;
         Parser p;
         const auto deck = p.parseString(deckStr, context);
         return new EclipseState(deck,context);
@@ -1,10 +1,20 @@
 #include <ctime>
 #include <chrono>
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <map>
+#include <opm/parser/eclipse/Deck/Deck.hpp>
+#include <opm/parser/eclipse/EclipseState/Eclipse3DProperties.hpp>
+#include <opm/parser/eclipse/EclipseState/Grid/EclipseGrid.hpp>
+#include <opm/parser/eclipse/EclipseState/Runspec.hpp>
 #include <opm/parser/eclipse/EclipseState/Schedule/Schedule.hpp>
+#include <opm/parser/eclipse/Parser/ParseContext.hpp>
 
 #include <pybind11/stl.h>
 #include <pybind11/chrono.h>
 #include "sunbeam.hpp"
+#include "converters.hpp"
 
 
 namespace {
@@ -38,17 +48,28 @@ namespace {
         time_t local_time;
 
         gmtime_r(&utc_time, &utc_tm);
+        /* let mktime decide on daylight saving time, gmtime always clears it */
+        utc_tm.tm_isdst = -1;
         local_time = mktime(&utc_tm);
 
         return system_clock::from_time_t(local_time);
     }
 
-    std::vector< Well > get_wells( const Schedule& sch ) {
-        std::vector< Well > wells;
-        for( const auto& w : sch.getWells() )
-            wells.push_back( *w );
+    /*
+      The wells are returned as references into the schedule, not copies, and
+      are tied to the lifetime of the schedule object.
+    */
+    Schedule * fromDeck( const Deck& deck,
+                         const EclipseGrid& grid,
+                         const Eclipse3DProperties& props,
+                         const ParseContext& context ) {
+        py::gil_scoped_release release;
+        const Runspec runspec( deck );
+        return new Schedule( context, grid, props, deck, runspec.phases() );
+    }
 
-        return wells;
+    std::vector< const Well* > get_wells( const Schedule& sch ) {
+        return sch.getWells();
     }
 
     const Well& get_well( const Schedule& sch, const std::string& name ) try {
@@ -86,19 +107,639 @@ namespace {
         return groups;
     }
 
+    std::map< std::string, int > group_indices( const Schedule& sch ) {
+        std::map< std::string, int > index;
+        for( const auto* g : sch.getGroups() )
+            index.emplace( g->name(), int( index.size() ) );
+        return index;
+    }
+
+    /*
+      The state of every well at every timestep, as wells x timesteps arrays.
+      Timesteps where a well is not yet defined have status 0 and group -1.
+    */
+    py::dict well_timeline( const Schedule& sch ) {
+        const auto wells = sch.getWells();
+        const auto groups = group_indices( sch );
+        const size_t nw = wells.size();
+        const size_t nt = sch.getTimeMap().size();
+
+        auto status = matrix< std::int8_t >( nw, nt );
+        auto defined = matrix< bool >( nw, nt );
+        auto producer = matrix< bool >( nw, nt );
+        auto injector = matrix< bool >( nw, nt );
+        auto group = matrix< int >( nw, nt );
+
+        auto* st = status.mutable_data();
+        auto* df = defined.mutable_data();
+        auto* pr = producer.mutable_data();
+        auto* in = injector.mutable_data();
+        auto* gr = group.mutable_data();
+
+        py::list names;
+        for( const auto* w : wells ) {
+            names.append( w->name() );
+            for( size_t t = 0; t < nt; ++t ) {
+                *df = w->hasBeenDefined( t );
+                if( *df ) {
+                    const auto g = groups.find( w->getGroupName( t ) );
+                    *st = static_cast< std::int8_t >( w->getStatus( t ) );
+                    *pr = w->isProducer( t );
+                    *in = w->isInjector( t );
+                    *gr = g == groups.end() ? -1 : g->second;
+                } else {
+                    *st = 0;
+                    *pr = false;
+                    *in = false;
+                    *gr = -1;
+                }
+                ++st; ++df; ++pr; ++in; ++gr;
+            }
+        }
+
+        py::list group_names;
+        for( const auto* g : sch.getGroups() )
+            group_names.append( g->name() );
+
+        py::dict status_codes;
+        for( const auto s : { WellCommon::OPEN, WellCommon::STOP,
+                              WellCommon::SHUT, WellCommon::AUTO } )
+            status_codes[ py::str( WellCommon::Status2String( s ) ) ] = int( s );
+
+        py::dict ret;
+        ret["wells"] = names;
+        ret["groups"] = group_names;
+        ret["status_codes"] = status_codes;
+        ret["status"] = status;
+        ret["defined"] = defined;
+        ret["producer"] = producer;
+        ret["injector"] = injector;
+        ret["group"] = group;
+        return ret;
+    }
+
+    template< typename T >
+    bool same_tail( const std::vector< T >& all, const std::vector< T >& last ) {
+        return all.size() >= last.size()
+            && std::equal( last.begin(), last.end(), all.end() - last.size() );
+    }
+
+    template< typename T >
+    py::array_t< T > to_matrix( const std::vector< T >& v, size_t rows, size_t cols ) {
+        auto m = matrix< T >( rows, cols );
+        std::copy( v.begin(), v.end(), m.mutable_data() );
+        return m;
+    }
+
+    /*
+      The group tree and the group of every well, as one snapshot per run of
+      timesteps where neither changed. "snapshot" maps every timestep to its
+      snapshot, and the rows of "parent", "order" and "well_group" are the
+      snapshots. "order" lists the groups in the tree in depth first preorder
+      from FIELD, padded with -1, so the groups below a group are the ones
+      that directly follow it in order.
+    */
+    py::dict group_snapshots( const Schedule& sch ) {
+        const auto wells = sch.getWells();
+        const auto groups = group_indices( sch );
+        const size_t ng = groups.size();
+        const size_t nw = wells.size();
+        const size_t nt = sch.getTimeMap().size();
+
+        py::array_t< int > snapshot( nt );
+        auto* snap = snapshot.mutable_data();
+
+        std::vector< int > parent, order, well_group;
+        std::vector< int > par( ng ), ord( ng ), wg( nw );
+        std::vector< std::string > stack;
+        size_t count = 0;
+
+        for( size_t t = 0; t < nt; ++t ) {
+            const auto& tree = sch.getGroupTree( t );
+            std::fill( par.begin(), par.end(), -1 );
+            std::fill( ord.begin(), ord.end(), -1 );
+
+            size_t n = 0;
+            stack.assign( 1, "FIELD" );
+            while( !stack.empty() && n < ng ) {
+                const auto name = stack.back();
+                stack.pop_back();
+                const auto g = groups.find( name );
+                if( g == groups.end() ) continue;
+
+                ord[ n++ ] = g->second;
+                const auto children = tree.children( name );
+                for( auto c = children.rbegin(); c != children.rend(); ++c ) {
+                    const auto child = groups.find( *c );
+                    if( child == groups.end() ) continue;
+                    par[ child->second ] = g->second;
+                    stack.push_back( *c );
+                }
+            }
+
+            for( size_t w = 0; w < nw; ++w ) {
+                wg[ w ] = -1;
+                if( !wells[ w ]->hasBeenDefined( t ) ) continue;
+                const auto g = groups.find( wells[ w ]->getGroupName( t ) );
+                if( g != groups.end() ) wg[ w ] = g->second;
+            }
+
+            const bool same = count > 0
+                           && same_tail( parent, par )
+                           && same_tail( order, ord )
+                           && same_tail( well_group, wg );
+            if( !same ) {
+                parent.insert( parent.end(), par.begin(), par.end() );
+                order.insert( order.end(), ord.begin(), ord.end() );
+                well_group.insert( well_group.end(), wg.begin(), wg.end() );
+                ++count;
+            }
+            snap[ t ] = int( count ) - 1;
+        }
+
+        py::list group_names;
+        for( const auto* g : sch.getGroups() )
+            group_names.append( g->name() );
+
+        py::list well_names;
+        for( const auto* w : wells )
+            well_names.append( w->name() );
+
+        py::dict ret;
+        ret["groups"] = group_names;
+        ret["wells"] = well_names;
+        ret["snapshot"] = snapshot;
+        ret["parent"] = to_matrix( parent, count, ng );
+        ret["order"] = to_matrix( order, count, ng );
+        ret["well_group"] = to_matrix( well_group, count, nw );
+        return ret;
+    }
+
+    bool same_completions( const CompletionSet& a, const CompletionSet& b ) {
+        return a.size() == b.size()
+            && std::equal( a.begin(), a.end(), b.begin() );
+    }
+
+    /*
+      One row per (well, timestep, completion), emitted only for the timesteps
+      where the completion set of a well differs from the previous timestep.
+      A timestep where the set becomes empty gets a single marker row with
+      number -1, I, J and K -1 and NaN values, so that the latest timestep
+      <= t of a well always holds its completions at t. The columns are numpy
+      arrays, and the well column is an index into "wells".
+    */
+    py::dict completion_table( const Schedule& sch ) {
+        struct row {
+            int well;
+            int timestep;
+            const Completion* completion;
+        };
+
+        const auto wells = sch.getWells();
+        const size_t nt = sch.getTimeMap().size();
+
+        std::vector< row > rows;
+        py::list names;
+        for( size_t w = 0; w < wells.size(); ++w ) {
+            const auto* well = wells[ w ];
+            names.append( well->name() );
+
+            const CompletionSet* prev = nullptr;
+            for( size_t t = 0; t < nt; ++t ) {
+                if( !well->hasBeenDefined( t ) ) continue;
+
+                const auto& completions = well->getCompletions( t );
+                if( prev && same_completions( *prev, completions ) ) continue;
+                prev = &completions;
+
+                if( completions.size() == 0 )
+                    rows.push_back( { int( w ), int( t ), nullptr } );
+                for( const auto& c : completions )
+                    rows.push_back( { int( w ), int( t ), &c } );
+            }
+        }
+
+        const size_t n = rows.size();
+        py::array_t< int > well( n ), timestep( n ), I( n ), J( n ), K( n );
+        py::array_t< int > number( n ), sat_table_id( n ), segment_number( n );
+        py::array_t< std::int8_t > state( n ), direction( n );
+        py::array_t< bool > attached_to_segment( n );
+        py::array_t< double > center_depth( n ), diameter( n ), skin_factor( n );
+        py::array_t< double > transmissibility( n ), well_pi( n );
+
+        auto* well_             = well.mutable_data();
+        auto* timestep_         = timestep.mutable_data();
+        auto* I_                = I.mutable_data();
+        auto* J_                = J.mutable_data();
+        auto* K_                = K.mutable_data();
+        auto* number_           = number.mutable_data();
+        auto* sat_table_id_     = sat_table_id.mutable_data();
+        auto* segment_number_   = segment_number.mutable_data();
+        auto* state_            = state.mutable_data();
+        auto* direction_        = direction.mutable_data();
+        auto* attached_         = attached_to_segment.mutable_data();
+        auto* center_depth_     = center_depth.mutable_data();
+        auto* diameter_         = diameter.mutable_data();
+        auto* skin_factor_      = skin_factor.mutable_data();
+        auto* transmissibility_ = transmissibility.mutable_data();
+        auto* well_pi_          = well_pi.mutable_data();
+
+        for( size_t i = 0; i < n; ++i ) {
+            well_[ i ]             = rows[ i ].well;
+            timestep_[ i ]         = rows[ i ].timestep;
+
+            if( !rows[ i ].completion ) {
+                const double nan = std::numeric_limits< double >::quiet_NaN();
+                I_[ i ] = J_[ i ] = K_[ i ] = number_[ i ] = -1;
+                sat_table_id_[ i ] = segment_number_[ i ] = -1;
+                state_[ i ] = direction_[ i ] = 0;
+                attached_[ i ] = false;
+                center_depth_[ i ] = diameter_[ i ] = skin_factor_[ i ] = nan;
+                transmissibility_[ i ] = well_pi_[ i ] = nan;
+                continue;
+            }
+
+            const auto& c = *rows[ i ].completion;
+            I_[ i ]                = c.getI();
+            J_[ i ]                = c.getJ();
+            K_[ i ]                = c.getK();
+            number_[ i ]           = c.complnum();
+            sat_table_id_[ i ]     = c.getSatTableId();
+            segment_number_[ i ]   = c.getSegmentNumber();
+            state_[ i ]            = static_cast< std::int8_t >( c.getState() );
+            direction_[ i ]        = static_cast< std::int8_t >( c.getDirection() );
+            attached_[ i ]         = c.attachedToSegment();
+            center_depth_[ i ]     = c.getCenterDepth();
+            diameter_[ i ]         = c.getDiameter();
+            skin_factor_[ i ]      = c.getSkinFactor();
+            transmissibility_[ i ] = c.getConnectionTransmissibilityFactor();
+            well_pi_[ i ]          = c.getWellPi();
+        }
+
+        py::dict state_codes;
+        for( const auto s : { WellCompletion::OPEN, WellCompletion::SHUT,
+                              WellCompletion::AUTO } )
+            state_codes[ py::str( WellCompletion::StateEnum2String( s ) ) ] = int( s );
+
+        py::dict direction_codes;
+        for( const auto d : { WellCompletion::DirectionEnum::X,
+                              WellCompletion::DirectionEnum::Y,
+                              WellCompletion::DirectionEnum::Z } )
+            direction_codes[ py::str( WellCompletion::DirectionEnum2String( d ) ) ] = int( d );
+
+        py::dict ret;
+        ret["wells"] = names;
+        ret["state_codes"] = state_codes;
+        ret["direction_codes"] = direction_codes;
+        ret["well"] = well;
+        ret["timestep"] = timestep;
+        ret["I"] = I;
+        ret["J"] = J;
+        ret["K"] = K;
+        ret["number"] = number;
+        ret["sat_table_id"] = sat_table_id;
+        ret["segment_number"] = segment_number;
+        ret["state"] = state;
+        ret["direction"] = direction;
+        ret["attached_to_segment"] = attached_to_segment;
+        ret["center_depth"] = center_depth;
+        ret["diameter"] = diameter;
+        ret["skin_factor"] = skin_factor;
+        ret["transmissibility"] = transmissibility;
+        ret["well_pi"] = well_pi;
+        return ret;
+    }
+
+
+    /*
+      The production and injection controls of every well at every timestep,
+      as wells x timesteps arrays in SI units. The production columns are NaN
+      (codes 0, prediction_mode false) where the well is not a producer, and
+      the injection columns where it is not an injector.
+    */
+    py::dict well_controls( const Schedule& sch ) {
+        const auto wells = sch.getWells();
+        const size_t nw = wells.size();
+        const size_t nt = sch.getTimeMap().size();
+        const double nan = std::numeric_limits< double >::quiet_NaN();
+
+        auto oil_rate = matrix< double >( nw, nt );
+        auto water_rate = matrix< double >( nw, nt );
+        auto gas_rate = matrix< double >( nw, nt );
+        auto liquid_rate = matrix< double >( nw, nt );
+        auto resv_rate = matrix< double >( nw, nt );
+        auto bhp_limit = matrix< double >( nw, nt );
+        auto thp_limit = matrix< double >( nw, nt );
+        auto bhp_history = matrix< double >( nw, nt );
+        auto thp_history = matrix< double >( nw, nt );
+        auto prediction_mode = matrix< bool >( nw, nt );
+        auto control_mode = matrix< int >( nw, nt );
+
+        auto surface_injection_rate = matrix< double >( nw, nt );
+        auto reservoir_injection_rate = matrix< double >( nw, nt );
+        auto injection_bhp_limit = matrix< double >( nw, nt );
+        auto injection_thp_limit = matrix< double >( nw, nt );
+        auto injection_prediction_mode = matrix< bool >( nw, nt );
+        auto injection_control_mode = matrix< int >( nw, nt );
+        auto injector_type = matrix< int >( nw, nt );
+
+        auto* orat = oil_rate.mutable_data();
+        auto* wrat = water_rate.mutable_data();
+        auto* grat = gas_rate.mutable_data();
+        auto* lrat = liquid_rate.mutable_data();
+        auto* resv = resv_rate.mutable_data();
+        auto* bhp  = bhp_limit.mutable_data();
+        auto* thp  = thp_limit.mutable_data();
+        auto* bhph = bhp_history.mutable_data();
+        auto* thph = thp_history.mutable_data();
+        auto* pred = prediction_mode.mutable_data();
+        auto* mode = control_mode.mutable_data();
+
+        auto* srat  = surface_injection_rate.mutable_data();
+        auto* rrat  = reservoir_injection_rate.mutable_data();
+        auto* ibhp  = injection_bhp_limit.mutable_data();
+        auto* ithp  = injection_thp_limit.mutable_data();
+        auto* ipred = injection_prediction_mode.mutable_data();
+        auto* imode = injection_control_mode.mutable_data();
+        auto* itype = injector_type.mutable_data();
+
+        py::list names;
+        for( const auto* w : wells ) {
+            names.append( w->name() );
+            for( size_t t = 0; t < nt; ++t ) {
+                const bool defined = w->hasBeenDefined( t );
+
+                if( defined && w->isProducer( t ) ) {
+                    const auto& p = w->getProductionProperties( t );
+                    *orat = p.OilRate;
+                    *wrat = p.WaterRate;
+                    *grat = p.GasRate;
+                    *lrat = p.LiquidRate;
+                    *resv = p.ResVRate;
+                    *bhp  = p.BHPLimit;
+                    *thp  = p.THPLimit;
+                    *bhph = p.BHPH;
+                    *thph = p.THPH;
+                    *pred = p.predictionMode;
+                    *mode = int( p.controlMode );
+                } else {
+                    *orat = *wrat = *grat = *lrat = *resv = nan;
+                    *bhp = *thp = *bhph = *thph = nan;
+                    *pred = false;
+                    *mode = 0;
+                }
+
+                if( defined && w->isInjector( t ) ) {
+                    const auto& i = w->getInjectionProperties( t );
+                    *srat  = i.surfaceInjectionRate;
+                    *rrat  = i.reservoirInjectionRate;
+                    *ibhp  = i.BHPLimit;
+                    *ithp  = i.THPLimit;
+                    *ipred = i.predictionMode;
+                    *imode = int( i.controlMode );
+                    *itype = int( i.injectorType );
+                } else {
+                    *srat = *rrat = *ibhp = *ithp = nan;
+                    *ipred = false;
+                    *imode = 0;
+                    *itype = 0;
+                }
+
+                ++orat; ++wrat; ++grat; ++lrat; ++resv;
+                ++bhp; ++thp; ++bhph; ++thph; ++pred; ++mode;
+                ++srat; ++rrat; ++ibhp; ++ithp; ++ipred; ++imode; ++itype;
+            }
+        }
+
+        py::dict control_codes;
+        for( const auto m : { WellProducer::ORAT, WellProducer::WRAT,
+                              WellProducer::GRAT, WellProducer::LRAT,
+                              WellProducer::CRAT, WellProducer::RESV,
+                              WellProducer::BHP, WellProducer::THP,
+                              WellProducer::GRUP } )
+            control_codes[ py::str( WellProducer::ControlMode2String( m ) ) ] = int( m );
+
+        py::dict injection_control_codes;
+        for( const auto m : { WellInjector::RATE, WellInjector::RESV,
+                              WellInjector::BHP, WellInjector::THP,
+                              WellInjector::GRUP } )
+            injection_control_codes[ py::str( WellInjector::ControlMode2String( m ) ) ] = int( m );
+
+        py::dict injector_type_codes;
+        for( const auto k : { WellInjector::WATER, WellInjector::GAS,
+                              WellInjector::OIL, WellInjector::MULTI } )
+            injector_type_codes[ py::str( WellInjector::Type2String( k ) ) ] = int( k );
+
+        py::dict ret;
+        ret["wells"] = names;
+        ret["control_codes"] = control_codes;
+        ret["injection_control_codes"] = injection_control_codes;
+        ret["injector_type_codes"] = injector_type_codes;
+        ret["oil_rate"] = oil_rate;
+        ret["water_rate"] = water_rate;
+        ret["gas_rate"] = gas_rate;
+        ret["liquid_rate"] = liquid_rate;
+        ret["resv_rate"] = resv_rate;
+        ret["bhp_limit"] = bhp_limit;
+        ret["thp_limit"] = thp_limit;
+        ret["bhp_history"] = bhp_history;
+        ret["thp_history"] = thp_history;
+        ret["prediction_mode"] = prediction_mode;
+        ret["control_mode"] = control_mode;
+        ret["surface_injection_rate"] = surface_injection_rate;
+        ret["reservoir_injection_rate"] = reservoir_injection_rate;
+        ret["injection_bhp_limit"] = injection_bhp_limit;
+        ret["injection_thp_limit"] = injection_thp_limit;
+        ret["injection_prediction_mode"] = injection_prediction_mode;
+        ret["injection_control_mode"] = injection_control_mode;
+        ret["injector_type"] = injector_type;
+        return ret;
+    }
+
+    /*
+      The dates of the timesteps as posix seconds, taken directly from the
+      TimeMap, so unlike timesteps there is no timezone conversion.
+    */
+    py::array_t< std::int64_t > time_axis( const Schedule& sch ) {
+        const auto& tm = sch.getTimeMap();
+        py::array_t< std::int64_t > axis( tm.size() );
+        auto* ax = axis.mutable_data();
+        for( size_t i = 0; i < tm.size(); ++i )
+            ax[ i ] = static_cast< std::int64_t >( tm[ i ] );
+        return axis;
+    }
+
+    enum event_code : std::int8_t {
+        WELL_NEW = 0,
+        WELL_OPEN,
+        WELL_STOP,
+        WELL_SHUT,
+        WELL_AUTO,
+        WELL_CONTROL,
+        WELL_GROUP,
+        WELL_COMPLETIONS,
+        GROUP_NEW,
+        GROUP_PARENT,
+    };
+
+    event_code status_event( WellCommon::StatusEnum status ) {
+        switch( status ) {
+            case WellCommon::OPEN: return WELL_OPEN;
+            case WellCommon::STOP: return WELL_STOP;
+            case WellCommon::SHUT: return WELL_SHUT;
+            case WellCommon::AUTO: return WELL_AUTO;
+            default: throw std::logic_error( "Unhandled enum value" );
+        }
+    }
+
+    bool same_control( const Well& w, size_t prev, size_t t ) {
+        return w.isProducer( prev ) == w.isProducer( t )
+            && w.isInjector( prev ) == w.isInjector( t )
+            && w.getProductionProperties( prev ) == w.getProductionProperties( t )
+            && w.getInjectionProperties( prev ) == w.getInjectionProperties( t );
+    }
+
+    /*
+      One row per change of a well or group, in timestep order: wells that
+      are defined, change status, control (producer/injector, WCONPROD,
+      WCONHIST, WCONINJE and the like), group or completions, and groups
+      that enter the group tree or move in it. At the timestep where a well is
+      defined its status, group and completions are reported as changes too.
+      The rows of timestep t are offsets[t]:offsets[t + 1].
+    */
+    py::dict schedule_events( const Schedule& sch ) {
+        struct row {
+            int timestep;
+            event_code event;
+            int well;
+            int group;
+        };
+
+        const auto wells = sch.getWells();
+        const auto groups = group_indices( sch );
+        const size_t nt = sch.getTimeMap().size();
+
+        std::vector< std::string > group_names;
+        for( const auto* g : sch.getGroups() )
+            group_names.push_back( g->name() );
+
+        std::vector< row > rows;
+        py::array_t< int > offsets( nt + 1 );
+        auto* offsets_ = offsets.mutable_data();
+
+        std::vector< std::string > parents( group_names.size() );
+        std::vector< bool > in_tree( group_names.size(), false );
+
+        for( size_t t = 0; t < nt; ++t ) {
+            offsets_[ t ] = int( rows.size() );
+            const int step = int( t );
+
+            for( size_t w = 0; w < wells.size(); ++w ) {
+                const auto& well = *wells[ w ];
+                if( !well.hasBeenDefined( t ) ) continue;
+
+                const auto gr = groups.find( well.getGroupName( t ) );
+                const int group = gr == groups.end() ? -1 : gr->second;
+
+                if( t == 0 || !well.hasBeenDefined( t - 1 ) ) {
+                    rows.push_back( { step, WELL_NEW, int( w ), group } );
+                    rows.push_back( { step, status_event( well.getStatus( t ) ), int( w ), group } );
+                    rows.push_back( { step, WELL_GROUP, int( w ), group } );
+                    if( well.getCompletions( t ).size() > 0 )
+                        rows.push_back( { step, WELL_COMPLETIONS, int( w ), group } );
+                    continue;
+                }
+
+                if( well.getStatus( t ) != well.getStatus( t - 1 ) )
+                    rows.push_back( { step, status_event( well.getStatus( t ) ), int( w ), group } );
+                if( !same_control( well, t - 1, t ) )
+                    rows.push_back( { step, WELL_CONTROL, int( w ), group } );
+                if( well.getGroupName( t ) != well.getGroupName( t - 1 ) )
+                    rows.push_back( { step, WELL_GROUP, int( w ), group } );
+                if( !same_completions( well.getCompletions( t - 1 ), well.getCompletions( t ) ) )
+                    rows.push_back( { step, WELL_COMPLETIONS, int( w ), group } );
+            }
+
+            const auto& tree = sch.getGroupTree( t );
+            for( size_t g = 0; g < group_names.size(); ++g ) {
+                const auto& name = group_names[ g ];
+                if( name == "FIELD" || !tree.exists( name ) ) continue;
+
+                const auto& parent = tree.parent( name );
+                if( !in_tree[ g ] )
+                    rows.push_back( { step, GROUP_NEW, -1, int( g ) } );
+                else if( parent != parents[ g ] )
+                    rows.push_back( { step, GROUP_PARENT, -1, int( g ) } );
+                in_tree[ g ] = true;
+                parents[ g ] = parent;
+            }
+        }
+        offsets_[ nt ] = int( rows.size() );
+
+        const size_t n = rows.size();
+        py::array_t< int > timestep( n ), well( n ), group( n );
+        py::array_t< std::int8_t > event( n );
+
+        auto* timestep_ = timestep.mutable_data();
+        auto* event_    = event.mutable_data();
+        auto* well_     = well.mutable_data();
+        auto* group_    = group.mutable_data();
+
+        for( size_t i = 0; i < n; ++i ) {
+            timestep_[ i ] = rows[ i ].timestep;
+            event_[ i ]    = rows[ i ].event;
+            well_[ i ]     = rows[ i ].well;
+            group_[ i ]    = rows[ i ].group;
+        }
+
+        py::list well_names;
+        for( const auto* w : wells )
+            well_names.append( w->name() );
+
+        py::dict event_codes;
+        event_codes["WELL_NEW"]         = int( WELL_NEW );
+        event_codes["WELL_OPEN"]        = int( WELL_OPEN );
+        event_codes["WELL_STOP"]        = int( WELL_STOP );
+        event_codes["WELL_SHUT"]        = int( WELL_SHUT );
+        event_codes["WELL_AUTO"]        = int( WELL_AUTO );
+        event_codes["WELL_CONTROL"]     = int( WELL_CONTROL );
+        event_codes["WELL_GROUP"]       = int( WELL_GROUP );
+        event_codes["WELL_COMPLETIONS"] = int( WELL_COMPLETIONS );
+        event_codes["GROUP_NEW"]        = int( GROUP_NEW );
+        event_codes["GROUP_PARENT"]     = int( GROUP_PARENT );
+
+        py::dict ret;
+        ret["wells"] = well_names;
+        ret["groups"] = group_names;
+        ret["event_codes"] = event_codes;
+        ret["offsets"] = offsets;
+        ret["timestep"] = timestep;
+        ret["event"] = event;
+        ret["well"] = well;
+        ret["group"] = group;
+        return ret;
+    }
+
 }
 
 void sunbeam::export_Schedule(py::module& module) {
 
     py::class_< Schedule >( module, "Schedule")
-    .def_property_readonly( "_wells", &get_wells )
+    .def( py::init( &fromDeck ) )
+    .def_property_readonly( "_wells", &get_wells, ref_internal )
     .def_property_readonly( "_groups", &get_groups )
     .def_property_readonly( "start",  &get_start_time )
     .def_property_readonly( "end",    &get_end_time )
     .def_property_readonly( "timesteps", &get_timesteps )
-    .def("_getwell", &get_well)
+    .def("_getwell", &get_well, ref_internal)
     .def( "__contains__", &Schedule::hasWell )
     .def( "_group", &Schedule::getGroup, ref_internal)
-    .def( "_group_tree", &get_grouptree, ref_internal);
+    .def( "_group_tree", &get_grouptree, ref_internal)
+    .def( "_well_timeline", &well_timeline )
+    .def( "_completion_table", &completion_table )
+    .def( "_group_snapshots", &group_snapshots )
+    .def( "_time_axis", &time_axis )
+    .def( "_events", &schedule_events )
+    .def( "_well_controls", &well_controls );
 
 }
@@ -1,10 +1,19 @@
+#include <opm/parser/eclipse/Deck/Deck.hpp>
 #include <opm/parser/eclipse/EclipseState/Tables/TableManager.hpp>
+#include <opm/parser/eclipse/EclipseState/Tables/SimpleTable.hpp>
+#include <opm/parser/eclipse/EclipseState/Tables/TableColumn.hpp>
 
 #include "sunbeam.hpp"
+#include "converters.hpp"
 
 
 namespace {
 
+    TableManager * fromDeck( const Deck& deck ) {
+        py::gil_scoped_release release;
+        return new TableManager( deck );
+    }
+
     double evaluate( const TableManager& tab,
                      std::string tab_name,
                      int tab_idx,
@@ -14,12 +23,52 @@ namespace {
       throw py::key_error( e.what() );
     }
 
+    /*
+      A table column with the table and column lookups resolved up front, so
+      that evaluating it is only the interpolation. Evaluating it on an array
+      runs the interpolation for all x in one loop.
+    */
+    struct ColumnEvaluator {
+        const TableColumn& arg;
+        const TableColumn& col;
+
+        double eval( double x ) const {
+            return this->col.eval( this->arg.lookup( x ) );
+        }
+
+        py::array_t< double > eval_array(
+                py::array_t< double, py::array::c_style | py::array::forcecast > x ) const {
+            py::array_t< double > result( x.size() );
+            const auto* in = x.data();
+            auto* out = result.mutable_data();
+            for( ssize_t i = 0; i < x.size(); ++i )
+                out[i] = this->eval( in[i] );
+            return result;
+        }
+    };
+
+    ColumnEvaluator column( const TableManager& tab,
+                            const std::string& tab_name,
+                            int tab_idx,
+                            const std::string& col_name ) try {
+      const auto& table = tab[tab_name].getTable(tab_idx);
+      return { table.getColumn( 0 ), table.getColumn( col_name ) };
+    } catch( std::invalid_argument& e ) {
+      throw py::key_error( e.what() );
+    }
+
 }
 
 void sunbeam::export_TableManager(py::module& module) {
 
   py::class_< TableManager >( module, "Tables")
+    .def( py::init( &fromDeck ) )
     .def( "__contains__",   &TableManager::hasTables )
-    .def("_evaluate",       &evaluate );
+    .def("_evaluate",       &evaluate )
+    .def("_column",         &column, py::keep_alive< 0, 1 >() );
+
+  py::class_< ColumnEvaluator >( module, "TableColumnEvaluator")
+    .def( "__call__", &ColumnEvaluator::eval )
+    .def( "__call__", &ColumnEvaluator::eval_array );
 
 }
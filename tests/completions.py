@@ -44,5 +44,36 @@ class TestWells(unittest.TestCase):
                 for completion in well.completions(timestep):
                     self.assertFalse(completion.attached_to_segment)
 
+    def test_completion_table(self):
+        sch = self.spe3.schedule
+        ct = sch.completion_table()
+        self.assertIs(ct, sch.completion_table())
+        self.assertEqual([w.name for w in self.wells], ct['wells'])
+
+        n = len(ct['well'])
+        for key in ('timestep', 'I', 'J', 'K', 'number', 'state', 'direction',
+                    'transmissibility', 'skin_factor', 'well_pi'):
+            self.assertEqual(n, len(ct[key]))
+
+        for w, well in enumerate(self.wells):
+            rows = ct['well'] == w
+            steps = ct['timestep'][rows]
+            for t in range(len(sch.timesteps)):
+                if not well.isdefined(t):
+                    self.assertFalse((steps <= t).any())
+                    continue
+
+                # the completions at t are the rows of the latest step <= t
+                latest = steps[steps <= t].max()
+                at = rows & (ct['timestep'] == latest) & (ct['number'] >= 0)
+                completions = list(well.completions(t))
+                self.assertEqual(len(completions), at.sum())
+                for c, i in zip(completions, at.nonzero()[0]):
+                    self.assertEqual(c.pos, (ct['I'][i], ct['J'][i], ct['K'][i]))
+                    self.assertEqual(c.number, ct['number'][i])
+                    self.assertEqual(ct['state_codes'][c.state], ct['state'][i])
+                    self.assertEqual(ct['direction_codes'][c.direction], ct['direction'][i])
+                    self.assertEqual(c.transmissibility, ct['transmissibility'][i])
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,6 @@
+import gc
 import unittest
+import numpy as np
 import sunbeam
 
 class TestParse(unittest.TestCase):
@@ -67,6 +69,51 @@ FIPNUM
         self.assertEqual(len(self.deck['FIPNUM'][0]), 1)
         self.assertEqual(len(self.deck['FIPNUM'][0][0]), 4)
 
+    def test_deck_index(self):
+        self.assertEqual(self.deck.positions('DX'), [4])
+        self.assertEqual(self.deck.positions('WCONPROD'), [])
+        self.assertEqual(self.deck.count('DX'), 1)
+        self.assertEqual(self.deck.count('WCONPROD'), 0)
+        self.assertEqual([kw.name for kw in self.deck.keywords('FIPNUM')],
+                         ['FIPNUM'])
+        self.assertEqual([kw.name for kw in self.deck.section('GRID')],
+                         ['DX', 'DY', 'DZ', 'TOPS'])
+        self.assertEqual([kw.name for kw in self.deck.section('REGIONS')],
+                         ['OPERNUM', 'FIPNUM'])
+        with self.assertRaises(KeyError):
+            self.deck.section('SCHEDULE')
+        self.assertEqual(self.deck['DX'].name, 'DX')
+        self.assertEqual(self.deck['DX', 0].name, 'DX')
+        self.assertEqual(self.deck[2].name, 'DIMENS')
+
+    def test_record_array(self):
+        dx = self.deck['DX'][0].array(0)
+        self.assertEqual(dx.dtype, np.float64)
+        self.assertEqual(list(dx), [0.25] * 4)
+        self.assertFalse(dx.flags.writeable)
+
+        opernum = self.deck['OPERNUM'][0].array('data')
+        self.assertEqual(opernum.dtype, np.int32)
+        self.assertEqual(list(opernum), [3, 3, 1, 2])
+
+        start = self.deck['START'][0]
+        self.assertEqual(list(start.array(0)), [10])
+        with self.assertRaises(TypeError):
+            start.array(1)
+
+        self.assertEqual(list(self.deck['DX'][0].defaulted(0)), [False] * 4)
+
+    def test_record_array_units(self):
+        deck = sunbeam.parse_deck('RUNSPEC\nFIELD\nGRID\nDX\n2*10 /')
+        rec = deck['DX'][0]
+        self.assertEqual(list(rec.array(0)), [10, 10])
+        np.testing.assert_allclose(rec.array(0, si=True), [3.048, 3.048])
+
+    def test_record_array_keeps_deck_alive(self):
+        dx = sunbeam.parse_deck(self.DECK_STRING)['DX'][0].array(0)
+        gc.collect()
+        self.assertEqual(list(dx), [0.25] * 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -31,5 +31,34 @@ class TestGroupTree(unittest.TestCase):
         self.assertEqual(sunbeam.schedule.Group, type(child))
         self.assertEqual(set(children), set(names))
 
+    def test_group_hierarchy(self):
+        sch = self.es.schedule
+        snapshots = sch.group_snapshots()
+        self.assertEqual(len(sch.timesteps), len(snapshots['snapshot']))
+        self.assertLessEqual(len(snapshots['parent']), len(sch.timesteps))
+        for t in range(1, len(sch.timesteps)):
+            if snapshots['snapshot'][t] == snapshots['snapshot'][t - 1]:
+                self.assertIs(sch.group_hierarchy(t), sch.group_hierarchy(t - 1))
+
+        h = sch.group_hierarchy(3)
+        self.assertIs(h, sch.group_hierarchy(3))
+        self.assertEqual('FIELD', h.groups[0])
+        self.assertIsNone(h.parent('FIELD'))
+        self.assertEqual('FIELD', h.parent('PROD'))
+        self.assertEqual('MANI-B1', h.children('PROD')[0])
+        self.assertEqual(6, len(h.children('PROD')))
+
+        below = set(h.wells('PROD'))
+        for child in h.children('PROD'):
+            below.update(h.subtree_wells(child))
+        self.assertEqual(below, set(h.subtree_wells('PROD')))
+
+        prod = sch.group(timestep=3)['PROD']
+        self.assertEqual(set(h.subtree_wells('PROD')),
+                         set(w.name for w in prod.subtree_wells))
+
+        with self.assertRaises(IndexError):
+            sch.group_hierarchy(len(sch.timesteps))
+
 if __name__ == '__main__':
     unittest.main()
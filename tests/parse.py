@@ -1,6 +1,12 @@
+import json
+import os
+import os.path
+import shutil
+import sys
+import tempfile
 import unittest
 import sunbeam
-import os.path
+import sunbeam.includes
 
 class TestParse(unittest.TestCase):
 
@@ -61,6 +67,121 @@ FIPNUM
         regtest = sunbeam.parse(self.REGIONDATA)
         self.assertEqual([3,3,1,2], regtest.props()['OPERNUM'])
 
+    def test_parse_cache(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            deck = os.path.join(tmp, 'CACHE.DATA')
+            inc = os.path.join(tmp, 'OPERNUM.INC')
+            cache = os.path.join(tmp, 'cache')
+            with open(deck, 'w') as f:
+                f.write(self.REGIONDATA.replace('OPERNUM\n3 3 1 2 /\n',
+                                                "INCLUDE\n 'OPERNUM.INC' /\n"))
+            with open(inc, 'w') as f:
+                f.write('OPERNUM\n3 3 1 2 /\n')
+
+            self.assertEqual([deck, inc],
+                             sunbeam.includes.include_files(deck)[0])
+
+            cold = sunbeam.parse(deck, cache=cache)
+            self.assertEqual(2, len(os.listdir(cache)))
+            warm = sunbeam.parse(deck, cache=cache)
+            self.assertEqual([3,3,1,2], cold.props()['OPERNUM'])
+            self.assertEqual([3,3,1,2], warm.props()['OPERNUM'])
+            self.assertIn('OPERNUM', sunbeam.parse_deck(deck, cache=cache))
+
+            with open(inc, 'w') as f:
+                f.write('OPERNUM\n1 2 3 4 /\n')
+            changed = sunbeam.parse(deck, cache=cache)
+            self.assertEqual([1,2,3,4], changed.props()['OPERNUM'])
+
+            # an identical root deck elsewhere, with its own include
+            other = os.path.join(tmp, 'other')
+            os.mkdir(other)
+            shutil.copy(deck, other)
+            with open(os.path.join(other, 'OPERNUM.INC'), 'w') as f:
+                f.write('OPERNUM\n4 4 4 4 /\n')
+            copy = sunbeam.parse(os.path.join(other, 'CACHE.DATA'), cache=cache)
+            self.assertEqual([4,4,4,4], copy.props()['OPERNUM'])
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_parse_profile(self):
+        spe3 = sunbeam.parse(self.spe3fn, profile=True)
+        self.assertEqual('SPE 3 - CASE 1', spe3.title)
+
+        profile = spe3.profile
+        self.assertEqual([os.path.abspath(self.spe3fn)],
+                         [f['path'] for f in profile['files']])
+        names = [kw['name'] for kw in profile['keywords']]
+        self.assertIn('PERMX', names)
+        self.assertIn('WCONINJE', names)
+        wconinje = profile['keywords'][names.index('WCONINJE')]
+        self.assertEqual(2, wconinje['count'])
+        for stage in ('grid', 'tables', 'props', 'schedule', 'state'):
+            self.assertIn(stage, profile['stages'])
+        self.assertEqual(profile, json.loads(profile.to_json()))
+
+        self.assertIn('estimates', profile.summary())
+        with self.assertRaises(ValueError):
+            sunbeam.parse(self.spe3fn, sections=[], profile=True)
+        with self.assertRaises(ValueError):
+            sunbeam.parse(self.spe3fn, cache='cache', profile=True)
+
+        deck = sunbeam.parse_deck(self.spe3fn, profile=True)
+        self.assertIn('PERMX', deck)
+        self.assertNotIn('stages', deck.profile)
+
+    def test_parse_many(self):
+        decks = [self.spe3fn, self.REGIONDATA, 'NOT A DECK']
+        titles = {}
+        for r in sunbeam.parse_many(decks, workers=2, extract=lambda es: es.title):
+            self.assertEqual(decks[r.index], r.deck)
+            titles[r.index] = r.value, r.error
+
+        self.assertEqual(('SPE 3 - CASE 1', None), titles[0])
+        self.assertEqual(None, titles[1][1])
+        self.assertEqual(None, titles[2][0])
+        self.assertIsNotNone(titles[2][1])
+
+        recovery = ('PARSE_RANDOM_SLASH', sunbeam.action.ignore)
+        results = list(sunbeam.parse_many([self.spe3fn] * 3, recovery, workers=2))
+        self.assertEqual([0, 1, 2], sorted(r.index for r in results))
+        for r in results:
+            self.assertIsNone(r.error)
+            self.assertEqual('SPE 3 - CASE 1', r.value.title)
+
+    def test_parse_many_unpicklable_value(self):
+        decks = [self.spe3fn, self.REGIONDATA]
+        extract = lambda es: (lambda: 0) if 'SPE' in es.title else 'plain'
+        results = sorted(sunbeam.parse_many(decks, workers=2, extract=extract))
+        self.assertEqual([0, 1], [r.index for r in results])
+        self.assertIsNone(results[0].value)
+        self.assertIn('unpicklable', results[0].error)
+        self.assertEqual(('plain', None), (results[1].value, results[1].error))
+
+    def test_parse_many_unpicklable(self):
+        # without fork, extract is pickled and a lambda is rejected up front
+        can_fork = sunbeam.parser._can_fork
+        sunbeam.parser._can_fork = lambda: False
+        try:
+            with self.assertRaises(TypeError):
+                next(sunbeam.parse_many([self.spe3fn], extract=lambda es: es.title))
+        finally:
+            sunbeam.parser._can_fork = can_fork
+
+    @unittest.skipIf(sys.version_info < (3, 4), 'asyncio requires python 3.4')
+    def test_parse_async(self):
+        import asyncio
+        loop = asyncio.new_event_loop()
+        try:
+            futures = [sunbeam.parse_async(self.spe3fn, loop=loop),
+                       sunbeam.parse_async(self.REGIONDATA, loop=loop)]
+            spe3, regions = loop.run_until_complete(asyncio.gather(*futures))
+        finally:
+            loop.close()
+        self.assertEqual('SPE 3 - CASE 1', spe3.title)
+        self.assertEqual([3,3,1,2], regions.props()['OPERNUM'])
+
     def test_parse_norne(self):
          es = sunbeam.parse(self.norne_fname, recovery=('PARSE_RANDOM_SLASH', sunbeam.action.ignore))
          self.assertEqual(46, es.grid().getNX())
@@ -66,6 +66,58 @@ FIPNUM
         self.assertIn( 'TESTKEY1', deck )
         self.assertIn( 'TESTKEY2', deck )
 
+    def test_stream(self):
+        full = [kw.name for kw in sunbeam.parse_deck(self.spe3fn)]
+        streamed = [kw.name for kw in sunbeam.stream_deck(self.spe3fn)]
+        self.assertEqual(full, streamed)
+
+        schedule = [kw.name for kw in sunbeam.stream_deck(self.spe3fn,
+                                                          sections=['SCHEDULE'])]
+        self.assertEqual(full[full.index('SCHEDULE'):], schedule)
+
+        wconinje = list(sunbeam.stream_deck(self.spe3fn, names=['WCONINJE']))
+        self.assertEqual(full.count('WCONINJE'), len(wconinje))
+        for kw in wconinje:
+            self.assertEqual('WCONINJE', kw.name)
+
+        self.assertEqual([], list(sunbeam.stream_deck(self.spe3fn,
+                                                      names=['WCONINJE'],
+                                                      sections=['GRID'])))
+        with self.assertRaises(ValueError):
+            list(sunbeam.stream_deck(self.spe3fn, sections=['NOSUCH']))
+
+    def test_stream_section_names(self):
+        deck = '\n'.join(['RUNSPEC',
+                          'TITLE',
+                          'GRID REFINEMENT STUDY',
+                          'DIMENS',
+                          ' 2 2 1 /',
+                          'GRID -- starts here',
+                          'DX',
+                          ' 4*1 /',
+                          ''])
+        names = [kw.name for kw in sunbeam.stream_deck(deck, sections=['RUNSPEC'])]
+        self.assertEqual(['RUNSPEC', 'TITLE', 'DIMENS'], names)
+        names = [kw.name for kw in sunbeam.stream_deck(deck, sections=['GRID'])]
+        self.assertEqual(['GRID', 'DX'], names)
+
+        dx, = sunbeam.stream_deck(deck, names=['DX'])
+        self.assertEqual(4, len(dx[0].array(0)))
+
+        self.assertEqual([], list(sunbeam.stream_deck(deck, names=[])))
+        self.assertEqual([], list(sunbeam.stream_deck(self.spe3fn, names=())))
+        # nothing is parsed, so not even a broken deck fails
+        broken = deck.replace(' 4*1 /', ' 4*1 /\nNOSUCHKEYWORD\n 1 2 3 /')
+        self.assertEqual([], list(sunbeam.stream_deck(broken, names=[])))
+
+    def test_stream_extension(self):
+        error_recovery = ("PARSE_RANDOM_SLASH", sunbeam.action.ignore)
+        names = [kw.name for kw in sunbeam.stream_deck(
+            self.DECK_ADDITIONAL_KEYWORDS, sections=['GRID', 'REGIONS'],
+            keywords=self.KEYWORDS, recovery=error_recovery)]
+        self.assertEqual(['GRID', 'DX', 'DY', 'DZ', 'TOPS',
+                          'REGIONS', 'OPERNUM', 'FIPNUM'], names)
+
 
 
 if __name__ == "__main__":
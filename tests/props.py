@@ -1,8 +1,35 @@
+import gc
+import os
+import shutil
+import tempfile
 import unittest
+import numpy as np
 import sunbeam
+import sunbeam.propfile
 
 class TestProps(unittest.TestCase):
 
+    REGIONDATA = """
+START             -- 0
+10 MAI 2007 /
+RUNSPEC
+
+DIMENS
+2 2 1 /
+GRID
+DX
+4*0.25 /
+DY
+4*0.25 /
+DZ
+4*0.25 /
+TOPS
+4*0.25 /
+REGIONS
+OPERNUM
+3 3 1 2 /
+"""
+
     def assertClose(self, expected, observed, epsilon=1e-08):
         diff = abs(expected - observed)
         err_msg = '|%g - %g| = %g > %g' % (expected, observed, diff, epsilon)
@@ -31,6 +58,159 @@ class TestProps(unittest.TestCase):
         print(len(px))
         self.assertEqual(324, len(px))
 
+    def test_array(self):
+        p = self.props
+        poro = p.array('PORO')
+        self.assertEqual(324, poro.size)
+        self.assertEqual(np.float64, poro.dtype)
+        self.assertEqual(p['PORO'], poro.tolist())
+        self.assertFalse(poro.flags.writeable)
+        with self.assertRaises(ValueError):
+            poro[0] = 1.0
+
+        with self.assertRaises(KeyError):
+            p.array('NONO')
+
+    def test_int_array(self):
+        p = sunbeam.parse(self.REGIONDATA).props()
+        opernum = p.array('OPERNUM')
+        self.assertEqual(np.int32, opernum.dtype)
+        self.assertEqual([3,3,1,2], opernum.tolist())
+
+    def test_array_keeps_state_alive(self):
+        permx = sunbeam.parse('spe3/SPE3CASE1.DATA').props().array('PERMX')
+        gc.collect()
+        self.assertEqual(324, len(permx))
+        self.assertEqual(self.props['PERMX'], permx.tolist())
+
+    def test_propfile(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmp, 'PORO.prop')
+            with open(fname, 'w') as f:
+                f.write('-- porosity / ntg\nPORO\n0.1 2*0.2 -- a / comment\n'
+                        '0.3 /\nNOECHO\nFIPNUM\n1 2\n3 4/\n')
+
+            arrays = sunbeam.propfile.load(fname)
+            self.assertEqual([0.1, 0.2, 0.2, 0.3], arrays['PORO'].tolist())
+            self.assertEqual(np.int32, arrays['FIPNUM'].dtype)
+            self.assertEqual([1, 2, 3, 4], arrays['FIPNUM'].tolist())
+            self.assertFalse(arrays['PORO'].flags.writeable)
+
+            sunbeam.propfile.load(fname, write_sidecar=True)
+            mapped = sunbeam.propfile.load(fname)
+            self.assertIsInstance(mapped['PORO'], np.memmap)
+            self.assertEqual([1, 2, 3, 4], mapped['FIPNUM'].tolist())
+
+            # a partial sidecar is not used
+            os.remove(fname + '.FIPNUM.npy')
+            self.assertNotIsInstance(sunbeam.propfile.load(fname)['PORO'],
+                                     np.memmap)
+
+            # a sidecar older than the text is not used
+            sunbeam.propfile.load(fname, write_sidecar=True)
+            os.utime(fname, (os.path.getmtime(fname) + 10,) * 2)
+            self.assertNotIsInstance(sunbeam.propfile.load(fname)['PORO'],
+                                     np.memmap)
+
+            dz = os.path.join(tmp, 'DZ.prop')
+            with open(dz, 'w') as f:
+                f.write('DZ\n2*10 /\n')
+            self.assertEqual([10, 10], sunbeam.propfile.load(dz)['DZ'].tolist())
+            self.assertEqual([3.048, 3.048],
+                             sunbeam.propfile.load(dz, units='FIELD')['DZ'].tolist())
+
+            # the later records of a multi-record keyword are not dropped
+            swof = os.path.join(tmp, 'SWOF.INC')
+            with open(swof, 'w') as f:
+                f.write('SWOF\n0 0 1 0\n1 1 0 0 /\n0 0 1 0\n1 1 0 0 /\n')
+            with self.assertRaises(ValueError):
+                sunbeam.propfile.load(swof)
+
+            box = os.path.join(tmp, 'BOX.prop')
+            with open(box, 'w') as f:
+                f.write('BOX\n1 1 1 1 1 1 /\nPORO\n0.1 /\nENDBOX\n')
+            with self.assertRaises(ValueError):
+                sunbeam.propfile.load(box)
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_propfile_deck(self):
+        deck = 'spe3/SPE3CASE1.DATA'
+        arrays = sunbeam.propfile.load_deck(deck)
+        self.assertEqual({}, arrays)  # SPE3 has no property includes
+
+        tmp = tempfile.mkdtemp()
+        try:
+            with open(deck) as f:
+                text = f.read()
+            head, tail = text.split('PORO\n', 1)
+            poro = os.path.join(tmp, 'PORO.prop')
+            with open(poro, 'w') as f:
+                f.write('PORO\n324*0.2 /\nPERMX\n324*100 /\n')
+            # table includes are left out, not loaded or failing
+            tables = os.path.join(tmp, 'TABLES.INC')
+            with open(tables, 'w') as f:
+                f.write('SWOF\n0 0 1 0\n1 1 0 0 /\n0 0 1 0\n1 1 0 0 /\n'
+                        'ROCK\n1 2 /\n')
+            tail = tail.replace('\nPROPS\n', "\nPROPS\nINCLUDE\n 'TABLES.INC' /\n")
+            fname = os.path.join(tmp, 'SPE3.DATA')
+            with open(fname, 'w') as f:
+                f.write(head + "INCLUDE\n 'PORO.prop' /\nPORO\n" + tail)
+
+            arrays = sunbeam.propfile.load_deck(fname)
+            self.assertEqual(set(['PORO', 'PERMX']), set(arrays))
+            self.assertAlmostEqual(100 * 9.869233e-16, arrays['PERMX'][0])
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_region_stats(self):
+        es = sunbeam.parse(self.REGIONDATA)
+        # OPERNUM 3 3 1 2
+        stats = es.region_stats('OPERNUM', [1., 2., 3., 4.],
+                                weights=[1., 3., 1., 1.])
+        self.assertEqual([1, 2, 3], stats['region'].tolist())
+        self.assertEqual([1, 1, 2], stats['count'].tolist())
+        self.assertEqual([3, 4, 3], stats['sum'].tolist())
+        self.assertEqual([3, 4, 1.5], stats['mean'].tolist())
+        self.assertEqual([3, 4, 1], stats['min'].tolist())
+        self.assertEqual([3, 4, 2], stats['max'].tolist())
+        self.assertEqual([3, 4, 1.75], stats['weighted_mean'].tolist())
+
+        grid = self.spe3.grid()
+        pv = grid.getCellVolumes() * self.props.array('PORO')
+        stats = self.spe3.region_stats('SATNUM', pv)
+        self.assertEqual([1], stats['region'].tolist())
+        total = pv[grid.activeMask()].sum()
+        self.assertClose(total, stats['sum'][0], 1e-12 * total)
+        permx = self.spe3.region_stats('SATNUM', 'PERMX', active_only=False)
+        self.assertEqual(324, permx['count'][0])
+        self.assertClose(max(self.props['PERMX']), permx['max'][0])
+
+        with self.assertRaises(TypeError):
+            self.spe3.region_stats('PORO', pv)
+
+        # FIPNUM is not in the deck, and defaults to 1
+        fip = es.region_stats('FIPNUM', [1., 2., 3., 4.])
+        self.assertEqual([1], fip['region'].tolist())
+        self.assertEqual([10], fip['sum'].tolist())
+
+        ones, mask = np.ones(4), np.ones(4, dtype=bool)
+        wide = np.array([1, 2, 3, 2**32 + 1], dtype=np.int64)
+        with self.assertRaises(ValueError):
+            sunbeam.libsunbeam._region_stats(wide, ones, ones, mask)
+        narrow = wide[:3].astype(np.uint64)
+        stats = sunbeam.libsunbeam._region_stats(narrow, ones[:3], ones[:3],
+                                                 mask[:3])
+        self.assertEqual([1, 2, 3], stats['region'].tolist())
+
+        # sparse ids are not expanded to a dense table of the largest id
+        sparse = sunbeam.parse(self.REGIONDATA.replace('3 3 1 2 /',
+                                                       '3 3 1 2000000000 /'))
+        stats = sparse.region_stats('OPERNUM', [1., 2., 3., 4.])
+        self.assertEqual([1, 3, 2000000000], stats['region'].tolist())
+        self.assertEqual([3, 3, 4], stats['sum'].tolist())
+
     def test_regions(self):
         p = self.props
         reg = p.getRegions('SATNUM')
@@ -67,6 +247,43 @@ class TestProps(unittest.TestCase):
                         self.assertClose(exp, grid.getCellVolume(g_idx))
                     self.assertEqual(grid.getCellVolume(g_idx), grid.getCellVolume(None, i, j, k))
 
+    def test_volumes(self):
+        grid = self.spe3.grid()
+        volumes = grid.getCellVolumes()
+        self.assertEqual((grid.cartesianSize(),), volumes.shape)
+        for g in range(grid.cartesianSize()):
+            self.assertEqual(grid.getCellVolume(g), volumes[g])
+
+        pv = volumes * self.props.array('PORO')
+        self.assertClose(pv.sum(), sum(self.props['PORV']), epsilon=1e-6 * pv.sum())
+
+    def test_ijks(self):
+        grid = self.spe3.grid()
+        ijk = grid.getIJKs()
+        self.assertEqual((grid.cartesianSize(), 3), ijk.shape)
+        g = grid.globalIndices(ijk[:,0], ijk[:,1], ijk[:,2])
+        self.assertEqual(list(range(grid.cartesianSize())), g.tolist())
+        self.assertEqual((7,5,3), tuple(ijk[295]))
+
+    def test_active(self):
+        grid = sunbeam.parse('data/CORNERPOINT_ACTNUM.DATA').grid()
+        n, na = grid.cartesianSize(), grid.nactive()
+        mask = grid.activeMask()
+        self.assertEqual(n, len(mask))
+        self.assertEqual(na, mask.sum())
+
+        a2g = grid.activeToGlobal()
+        g2a = grid.globalToActive()
+        self.assertEqual(na, len(a2g))
+        self.assertEqual(list(range(na)), g2a[a2g].tolist())
+        self.assertTrue((g2a[~mask] == -1).all())
+
+        self.assertEqual(na, len(grid.getCellVolumes(active_only=True)))
+        self.assertEqual(na, len(grid.getCellDepths(active_only=True)))
+        self.assertEqual((na, 3), grid.getIJKs(active_only=True).shape)
+        self.assertEqual(grid.getCellDepths()[a2g].tolist(),
+                         grid.getCellDepths(active_only=True).tolist())
+
 
 if __name__ == "__main__":
     unittest.main()
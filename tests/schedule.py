@@ -1,5 +1,8 @@
+import os
+import time
 import unittest
 import datetime as dt
+import numpy as np
 import sunbeam
 
 spe3 = sunbeam.parse('spe3/SPE3CASE1.DATA')
@@ -17,6 +20,52 @@ class TestSchedule(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.sch['foo']
 
+    def testWellsCached(self):
+        self.assertIs(self.spe3.schedule, self.spe3.schedule)
+        wells = self.sch.wells
+        self.assertIsNot(wells, self.sch.wells)
+        for a, b in zip(wells, self.sch.wells):
+            self.assertIs(a, b)
+        wells.pop()
+        self.assertEqual(len(wells) + 1, len(self.sch.wells))
+        for well in self.sch.wells:
+            self.assertIs(well, self.sch[well.name])
+        self.assertIs(self.sch._getwell('PROD'), self.sch['PROD']._sun)
+
+    def testWrappers(self):
+        prod = self.sch['PROD']
+        self.assertIs(prod, sunbeam.schedule.Well(prod._sun))
+        self.assertFalse(hasattr(prod, '__dict__'))
+        self.assertFalse(hasattr(self.sch, '__dict__'))
+        with self.assertRaises(AttributeError):
+            prod.foo = 1
+
+        groups = self.sch.groups(1)
+        self.assertIs(groups[0], sunbeam.schedule.Group(groups[0]._sun, self.sch, 1))
+        self.assertEqual(1, groups[0].timestep)
+
+    def testWrappersInitOnce(self):
+        class Inner(object):
+            pass
+
+        calls = []
+
+        @sunbeam.sunbeam.delegate(Inner)
+        class Outer(object):
+            __slots__ = ('value',)
+
+            def __init__(self, _, value):
+                calls.append(value)
+                self.value = value
+
+        inner = Inner()
+        outer = Outer(inner, 1)
+        outer.value = 2
+        self.assertIs(outer, Outer(inner, 1))
+        self.assertEqual(2, outer.value)
+        self.assertEqual([1], calls)
+        self.assertIsNot(outer, Outer(inner, 3))
+
     def testContains(self):
         self.assertTrue('PROD' in self.sch)
         self.assertTrue('INJ'  in self.sch)
@@ -32,6 +81,57 @@ class TestSchedule(unittest.TestCase):
         self.assertEqual(176, len(timesteps))
         self.assertEqual(dt.datetime(2016, 1, 1), timesteps[7])
 
+    def testTimeAxis(self):
+        axis = self.sch.time_axis
+        self.assertIs(axis, self.sch.time_axis)
+        self.assertEqual(np.dtype('datetime64[s]'), axis.dtype)
+        self.assertEqual(176, len(axis))
+        self.assertEqual(np.datetime64('2016-01-01'), axis[7])
+        self.assertFalse(axis.flags.writeable)
+        self.assertEqual(self.sch.timesteps, self.sch.timesteps)
+        self.assertEqual(axis.tolist(), self.sch.timesteps)
+
+    @unittest.skipIf(not hasattr(time, 'tzset'), 'requires time.tzset')
+    def testTimestepsTimezone(self):
+        # the dates are the deck dates, also off UTC and in summer time
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+        try:
+            sch = sunbeam.parse('spe3/SPE3CASE1.DATA').schedule
+            timesteps = sch.timesteps
+            self.assertEqual(sch.time_axis.tolist(), timesteps)
+            self.assertEqual(dt.datetime(2016, 1, 1), timesteps[7])
+            self.assertEqual(timesteps[0], sch.start)
+            self.assertTrue(any(t.month == 7 for t in timesteps))
+        finally:
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+
+    def testEvents(self):
+        events = self.sch.events()
+        self.assertIs(events, self.sch.events())
+        self.assertEqual(177, len(events['offsets']))
+        self.assertEqual(len(events['event']), events['offsets'][-1])
+
+        changes = self.sch.changes(0)
+        self.assertIn(('WELL_NEW', 'PROD'), changes)
+        self.assertIn(('WELL_NEW', 'INJ'), changes)
+        self.assertIn(('WELL_COMPLETIONS', 'PROD'), changes)
+
+        points = self.sch.change_points()
+        self.assertEqual(0, points[0])
+        for t in range(len(self.sch.timesteps)):
+            step = self.sch.events(t)
+            self.assertEqual(t in points, len(step['event']) > 0)
+            self.assertTrue(all(step['timestep'] == t))
+
+        with self.assertRaises(IndexError):
+            self.sch.events(176)
+
     def testGroups(self):
         g1 = self.sch.group()['G1'].wells
         self.assertEqual(2, len(g1))
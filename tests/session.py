@@ -0,0 +1,78 @@
+import os
+import os.path
+import shutil
+import tempfile
+import unittest
+import sunbeam
+
+class TestParseSession(unittest.TestCase):
+
+    def setUp(self):
+        with open('spe3/SPE3CASE1.DATA') as f:
+            text = f.read()
+        head, schedule = text.split('\nSCHEDULE\n', 1)
+
+        self.tmp = tempfile.mkdtemp()
+        self.deck = os.path.join(self.tmp, 'SPE3.DATA')
+        self.sch = os.path.join(self.tmp, 'SPE3.SCH')
+        with open(self.deck, 'w') as f:
+            f.write(head + "\nSCHEDULE\nINCLUDE\n 'SPE3.SCH' /\n")
+        with open(self.sch, 'w') as f:
+            f.write(schedule)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def edit(self, fname, old, new):
+        with open(fname) as f:
+            text = f.read()
+        with open(fname, 'w') as f:
+            f.write(text.replace(old, new))
+        # make sure the change is visible even with coarse mtimes
+        mtime = os.path.getmtime(fname) + 10
+        os.utime(fname, (mtime, mtime))
+
+    def test_session(self):
+        session = sunbeam.ParseSession(self.deck)
+        self.assertEqual(len(sunbeam.parse_deck(self.deck)), len(session.deck))
+        self.assertEqual([self.deck, self.sch], session.files)
+
+        state = session.state
+        grid, props = state.grid(), state.props()
+        self.assertEqual(set(['PROD', 'INJ']),
+                         set(w.name for w in state.schedule.wells))
+        self.assertEqual([], session.refresh())
+        self.assertIs(state, session.state)
+
+        self.edit(self.sch, "'INJ'", "'INJ2'")
+        self.assertEqual([self.sch], session.refresh())
+        self.assertIsNot(state, session.state)
+        self.assertIs(grid, session.state.grid())
+        self.assertIs(props, session.state.props())
+        self.assertEqual(set(['PROD', 'INJ2']),
+                         set(w.name for w in session.state.schedule.wells))
+        self.assertNotIn('props', session.timings)
+
+    def test_session_props(self):
+        session = sunbeam.ParseSession(self.deck)
+        grid, props = session.state.grid(), session.state.props()
+
+        self.edit(self.deck, '\nPROPS', '\nPROPS\n')
+        self.assertEqual([self.deck], session.refresh())
+        self.assertIs(grid, session.state.grid())
+        self.assertIsNot(props, session.state.props())
+
+    def test_session_units(self):
+        # SPE3 is in FIELD units, and EQUALS values are scaled by the deck
+        self.edit(self.deck, 'ECHO\n\nPROPS',
+                  "EQUALS\n 'DZ' 40 1 9 1 9 1 1 /\n/\nECHO\n\nPROPS")
+        session = sunbeam.ParseSession(self.deck)
+        expected = sunbeam.parse(self.deck).props()
+        props = session.state.props()
+        self.assertAlmostEqual(40 * 0.3048, props['DZ'][0])
+        for kw in ('DZ', 'PORO', 'PERMX'):
+            self.assertEqual(list(expected.array(kw)), list(props.array(kw)))
+
+
+if __name__ == "__main__":
+    unittest.main()
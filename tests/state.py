@@ -1,6 +1,12 @@
 import unittest
+import numpy as np
 import sunbeam
 
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
 class TestState(unittest.TestCase):
     FAULTS_DECK = """
 RUNSPEC
@@ -45,6 +51,27 @@ SWAT
 SATNUM
 1000*2 /
 \
+"""
+
+    NNC_DECK = """
+RUNSPEC
+DIMENS
+ 2 2 2 /
+OIL
+WATER
+GRID
+DX
+8*1 /
+DY
+8*1 /
+DZ
+8*1 /
+TOPS
+4*1 /
+NNC
+ 1 1 1 2 2 2 0.5 /
+/
+PROPS
 """
 
     @classmethod
@@ -61,6 +88,56 @@ SATNUM
     def test_state_nnc(self):
         self.assertFalse(self.state.has_input_nnc())
 
+    def test_nnc_arrays(self):
+        self.assertEqual(0, len(self.state.input_nnc_arrays()['trans']))
+        state = sunbeam.parse(self.NNC_DECK)
+        nnc = state.input_nnc_arrays()
+        self.assertEqual(state.input_nnc(),
+                         list(zip(nnc['cell1'].tolist(), nnc['cell2'].tolist(),
+                                  nnc['trans'].tolist())))
+        self.assertEqual([0], nnc['cell1'].tolist())
+        self.assertEqual([7], nnc['cell2'].tolist())
+
+        conn = state.connections()
+        # 12 neighbour connections in a 2x2x2 grid, and the NNC
+        self.assertEqual(13, len(conn['cell1']))
+        self.assertEqual([False] * 12 + [True], conn['nnc'].tolist())
+        self.assertEqual(12, len(state.connections(nnc=False)['cell1']))
+
+        data, indices, indptr = state.adjacency(format='raw')
+        self.assertEqual(26, len(data))
+        if sparse is None:
+            with self.assertRaises(ImportError):
+                state.adjacency(format='coo')
+        else:
+            self.assertEqual(26, state.adjacency(format='coo').nnz)
+
+    def test_connections(self):
+        grid = self.cp_state.grid()
+        nx, ny, nz = grid.getNX(), grid.getNY(), grid.getNZ()
+        active = grid.activeMask()
+        to_active = grid.globalToActive()
+        expected = set()
+        for g in range(nx * ny * nz):
+            i, j, k = g % nx, (g // nx) % ny, g // (nx * ny)
+            for h, inside in ((g + 1, i + 1 < nx),
+                              (g + nx, j + 1 < ny),
+                              (g + nx * ny, k + 1 < nz)):
+                if inside and active[g] and active[h]:
+                    expected.add((int(to_active[g]), int(to_active[h])))
+
+        conn = self.cp_state.connections()
+        self.assertEqual(expected, set(zip(conn['cell1'].tolist(),
+                                           conn['cell2'].tolist())))
+
+        data, indices, indptr = self.cp_state.adjacency(format='raw')
+        self.assertEqual(grid.nactive() + 1, len(indptr))
+        self.assertEqual(2 * len(expected), indptr[-1])
+        if sparse is not None:
+            adj = self.cp_state.adjacency()
+            self.assertEqual(indptr.tolist(), adj.indptr.tolist())
+            self.assertEqual(indices.tolist(), adj.indices.tolist())
+
     def test_grid(self):
         grid = self.state.grid()
         self.assertTrue('EclipseGrid' in repr(grid))
@@ -120,6 +197,24 @@ SATNUM
         with self.assertRaises(KeyError):
             self.spe3.table[tab, 'NO'](1)
 
+    def test_tables_array(self):
+        krw = self.spe3.table['SWOF', 'KRW']
+        xs = [0.5, 0.72]
+        ys = krw(xs)
+        self.assertEqual((2,), ys.shape)
+        self.assertAlmostEqual(0.1345, ys[0])
+        self.assertAlmostEqual(0.39,   ys[1])
+
+        sw = np.linspace(0, 1, 21)
+        self.assertEqual([krw(x) for x in sw], krw(sw).tolist())
+        self.assertEqual((3, 7), krw(sw.reshape(3, 7)).shape)
+
+        krow = self.spe3.table['SWOF']
+        self.assertAlmostEqual(0.1345, krow('KRW', np.array([0.5]))[0])
+
+        with self.assertRaises(KeyError):
+            self.spe3.table['SWOF', 'NO'](sw)
+
 
     def test_faults(self):
         self.assertEquals([], self.spe3.faultNames())
@@ -130,6 +225,77 @@ SATNUM
         f2 = faultdeck.faultFaces('F2')
         self.assertTrue((4,0,0,'X-') in f2)
         self.assertFalse((3,0,0,'X-') in f2)
+        self.assertEqual(sorted(f2), sorted(faultdeck.faults()['F2']))
+
+    def test_fault_table(self):
+        self.assertEqual(0, len(self.spe3.fault_table()['fault']))
+        table = sunbeam.parse(self.FAULTS_DECK).fault_table()
+        self.assertEqual(['F1', 'F2'], table['faults'])
+        self.assertEqual(2, len(table['multiplier']))
+        self.assertEqual(0.5, table['multiplier'][0])
+
+        # 'F2'  5  5  1  4   1  4  'X-': 4 x 4 faces
+        f2 = table['fault'] == 1
+        self.assertEqual(16, f2.sum())
+        self.assertTrue((table['i'][f2] == 4).all())
+        self.assertTrue((table['face'][f2] == table['face_codes']['X-']).all())
+        self.assertEqual(set(range(4)), set(table['j'][f2].tolist()))
+        g = table['global_index']
+        self.assertTrue((g == table['i'] + 10 * table['j'] + 100 * table['k']).all())
+
+    def test_lazy(self):
+        lazy = sunbeam.parse('spe3/SPE3CASE1.DATA', sections=[])
+        self.assertEqual(self.spe3.title, lazy.title)
+        self.assertEqual(['deck'], list(lazy.timings))
+
+        lazy.table
+        self.assertEqual(['deck', 'tables'], sorted(lazy.timings))
+
+        # the grid takes the ACTNUM of the props
+        self.assertEqual(self.spe3.grid().getNX(), lazy.grid().getNX())
+        self.assertEqual(['deck', 'grid', 'props', 'tables'], sorted(lazy.timings))
+
+        self.assertEqual(self.spe3.props()['PERMX'], lazy.props()['PERMX'])
+        self.assertAlmostEqual(0.1345, lazy.table['SWOF', 'KRW'](0.5))
+
+        self.assertEqual(len(self.spe3.schedule.timesteps),
+                         len(lazy.schedule.timesteps))
+        self.assertEqual(['INJ', 'PROD'], sorted(w.name for w in lazy.schedule.wells))
+        self.assertNotIn('state', lazy.timings)
+
+        # served by the full EclipseState, which then serves all sections
+        self.assertTrue(lazy.cfg().init().hasEquil())
+        self.assertIn('state', lazy.timings)
+        self.assertIs(lazy._section('state')._grid(), lazy._section('grid'))
+        for timing in lazy.timings.values():
+            self.assertTrue(timing['seconds'] >= 0)
+
+    def test_lazy_actnum(self):
+        deck = '\n'.join(['RUNSPEC', 'DIMENS', ' 2 2 1 /',
+                          'GRID', 'DX', ' 4*1 /', 'DY', ' 4*1 /', 'DZ', ' 4*1 /',
+                          'TOPS', ' 4*1 /', 'PORO', ' 4*0.2 /',
+                          'EQUALS', " 'ACTNUM' 0 1 1 1 1 1 1 /", '/', ''])
+        full = sunbeam.parse(deck)
+        lazy = sunbeam.parse(deck, sections=[])
+        self.assertEqual(3, full.grid().nactive())
+        self.assertEqual(full.grid().nactive(), lazy.grid().nactive())
+        self.assertEqual(full.grid().activeMask().tolist(),
+                         lazy.grid().activeMask().tolist())
+
+        # the grid keeps its own ACTNUM when the properties have none
+        for fname in ('data/CORNERPOINT_ACTNUM.DATA', 'spe3/SPE3CASE1.DATA'):
+            full = sunbeam.parse(fname)
+            lazy = sunbeam.parse(fname, sections=['props'])
+            self.assertEqual(full.grid().activeMask().tolist(),
+                             lazy.grid().activeMask().tolist())
+            self.assertEqual('ACTNUM' in full.props(), 'ACTNUM' in lazy.props())
+
+    def test_lazy_sections(self):
+        lazy = sunbeam.parse('spe3/SPE3CASE1.DATA', sections=['schedule'])
+        self.assertEqual(['deck', 'grid', 'props', 'schedule', 'tables'],
+                         sorted(lazy.timings))
+        with self.assertRaises(ValueError):
+            sunbeam.parse('spe3/SPE3CASE1.DATA', sections=['nosuch'])
 
     def test_jfunc(self):
         # jf["FLAG"]         = WATER; # set in deck
@@ -1,4 +1,5 @@
 import unittest
+import math
 import sunbeam
 
 class TestWells(unittest.TestCase):
@@ -88,6 +89,77 @@ class TestWells(unittest.TestCase):
         closed1  = filter(sunbeam.Well.closed(1), self.wells)
         self.assertListEqual(list(closed), list(closed1))
 
+    def testTimeline(self):
+        sch = self.spe3.schedule
+        tl = sch.well_timeline()
+        self.assertIs(tl, sch.well_timeline())
+        self.assertEqual([w.name for w in self.wells], tl['wells'])
+
+        shape = (len(self.wells), len(self.timesteps))
+        for key in ('status', 'defined', 'producer', 'injector', 'group'):
+            self.assertEqual(shape, tl[key].shape)
+
+        for w, well in enumerate(self.wells):
+            for t in range(len(self.timesteps)):
+                self.assertEqual(well.isdefined(t), tl['defined'][w, t])
+                if not well.isdefined(t):
+                    continue
+                self.assertEqual(tl['status_codes'][well.status(t)], tl['status'][w, t])
+                self.assertEqual(well.isproducer(t), tl['producer'][w, t])
+                self.assertEqual(well.isinjector(t), tl['injector'][w, t])
+                self.assertEqual(well.group(t), tl['groups'][tl['group'][w, t]])
+
+    def testWellMask(self):
+        sch = self.spe3.schedule
+        mask = sch.well_mask(['producer', 'flowing'])
+        self.assertEqual((len(self.wells), len(self.timesteps)), mask.shape)
+        self.assertEqual(mask[:, 5:10].tolist(),
+                         sch.well_mask(['producer', 'flowing'], slice(5, 10)).tolist())
+
+        names = sch.well_names(['producer', 'flowing'])
+        self.assertEqual(len(self.timesteps), len(names))
+        for t in (0, 10, len(self.timesteps) - 1):
+            flowing = sunbeam.Well.flowing(t)
+            producer = sunbeam.Well.producer(t)
+            expected = [w.name for w in self.wells if producer(w) and flowing(w)]
+            self.assertEqual(expected, names[t])
+            self.assertEqual(expected, sch.well_names(['producer', 'flowing'], t))
+
+            injector = sunbeam.Well.injector(t)
+            expected = [w.name for w in self.wells if not injector(w)]
+            self.assertEqual(expected, sch.well_names('not injector', t))
+
+        with self.assertRaises(ValueError):
+            sch.well_mask('sideways')
+
+    def testWellControls(self):
+        sch = self.spe3.schedule
+        ctl = sch.well_controls()
+        self.assertIs(ctl, sch.well_controls())
+
+        shape = (len(self.wells), len(self.timesteps))
+        for key in ('oil_rate', 'gas_rate', 'bhp_limit', 'control_mode',
+                    'surface_injection_rate', 'injector_type'):
+            self.assertEqual(shape, ctl[key].shape)
+
+        # FIELD units: 6200 Mscf/day, 500 psi
+        prod = ctl['wells'].index('PROD')
+        self.assertEqual(ctl['control_codes']['GRAT'], ctl['control_mode'][prod, 0])
+        self.assertAlmostEqual(6200e3 * 0.028316846592 / 86400,
+                               ctl['gas_rate'][prod, 0], places=4)
+        self.assertAlmostEqual(500 * 6894.757293168,
+                               ctl['bhp_limit'][prod, 0], places=0)
+        self.assertTrue(math.isnan(ctl['surface_injection_rate'][prod, 0]))
+
+        inj = ctl['wells'].index('INJ')
+        self.assertEqual(ctl['injector_type_codes']['GAS'], ctl['injector_type'][inj, 0])
+        self.assertEqual(ctl['injection_control_codes']['RATE'],
+                         ctl['injection_control_mode'][inj, 0])
+        self.assertAlmostEqual(4700e3 * 0.028316846592 / 86400,
+                               ctl['surface_injection_rate'][inj, 0], places=4)
+        self.assertEqual(0, ctl['surface_injection_rate'][inj, -1])
+        self.assertTrue(math.isnan(ctl['oil_rate'][inj, 0]))
+
     def testCompletions(self):
         w0 = self.wells[0]
         c0,c1 = w0.completions(len(self.timesteps) - 1)